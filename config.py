@@ -26,15 +26,43 @@ class Config:
     INITIAL_POPULATION = 100  # Population initiale
     CREATURE_MIN_SIZE = 2     # Taille minimale d'une créature
     CREATURE_MAX_SIZE = 8     # Taille maximale d'une créature
+    MEAL_SIZE = 5             # Nourriture mangée au maximum par repas
+    FOOD_ENERGY = 5           # Énergie gagnée par unité de nourriture
+    FOOD_ALLOCATION = "proportional"  # Partage d'une cellule disputée: "proportional" ou "first_come"
+    MAX_POPULATION = INITIAL_POPULATION * 3  # Au-delà, l'excédent est éliminé
+    CULLING_POLICY = "age_health"     # Élimination de l'excédent: "age_health", "random" ou "fitness"
 
     # Paramètres d'évolution
     MUTATION_RATE = 0.05      # Probabilité de mutation (5%)
     CROSSOVER_RATE = 0.7      # Probabilité de croisement (70%)
     SELECTION_PRESSURE = 1.5  # Influence de la fitness sur la sélection
+    SELECTION_METHOD = "tournament"  # "tournament", "roulette", "sus", "rank" ou "truncation"
+    TRUNCATION_RATIO = 0.5    # Part des créatures les plus adaptées retenues par troncature
 
+    # Paramètres de spéciation
+    SPECIATION_SAMPLE_SIZE = 10000   # Au-delà, k-means par mini-lots sur un échantillon (None = toujours complet)
+    SPECIATION_BATCH_SIZE = 1024     # Taille des mini-lots
+    SPECIATION_MAX_ITERATIONS = 20   # Itérations maximales du regroupement
+    SPECIATION_TIME_BUDGET = 50      # Durée maximale du regroupement en fin de journée (ms)
+    
     # Paramètres de simulation
     FOOD_SPAWN_RATE = 0.003   # Probabilité d'apparition de nourriture par cellule
     DAY_LENGTH = 500          # Durée d'un jour en frames
 
+    # Paramètres d'archivage
+    RUN_DIRECTORY = "runs"    # Dossier des données de simulation (None = pas d'écriture)
+    ARCHIVE_CHUNK_SIZE = 4096 # Créatures mortes gardées en mémoire avant écriture sur disque
+    STATS_LOG_CHUNK_SIZE = 1024  # Lignes de statistiques par bloc du journal sur disque
+    LINEAGE_PRUNE_THRESHOLD = 1000000  # Taille de la généalogie au-delà de laquelle les branches éteintes sont élaguées
+
+    # Paramètres d'historique des statistiques
+    HISTORY_RECENT = 1000       # Lignes gardées à pleine résolution
+    HISTORY_BUCKET_WIDTH = 10   # Lignes plus anciennes regroupées par tranche (min, moyenne, max)
+    HISTORY_MAX_BUCKETS = 1000  # Au-delà, les tranches sont fusionnées deux à deux
+    HISTOGRAM_BINS = 20         # Classes des histogrammes de traits
+    HISTOGRAM_HISTORY = 100     # Générations dont les histogrammes des traits sont conservés
+    COVARIANCE_HISTORY = 100    # Générations dont les corrélations des traits sont conservées
+    COVARIANCE_COMPONENTS = 3   # Composantes principales conservées par génération
+    
     # Paramètres de l'interface
     UI_PANEL_WIDTH = 200      # Largeur du panneau d'interface utilisateur
\ No newline at end of file
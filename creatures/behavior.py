@@ -2,6 +2,8 @@ import pygame
 import numpy as np
 from config import Config
 from creatures.creature import Creature
+from creatures.phenotype import Phenotype
+from simulation.spatial_index import SpatialIndex
 
 class Behavior:
     """
@@ -15,6 +17,14 @@ class Behavior:
     MATING = "mating"        # Reproduction
     RESTING = "resting"      # Repos pour récupérer de l'énergie
     MIGRATING = "migrating"  # Migration vers un nouvel environnement
+    
+    # Colonnes du vecteur génétique comparées pour la compatibilité (couleurs exclues)
+    COMPATIBILITY_COLUMNS = np.array([
+        i for i, trait in enumerate(Phenotype.TRAITS) if trait not in Phenotype.COLOR_TRAITS
+    ])
+    COMPATIBILITY_BOOLEAN = np.array([
+        trait in Phenotype.BOOLEAN_TRAITS for trait in Phenotype.TRAITS if trait not in Phenotype.COLOR_TRAITS
+    ])
 
     def __init__(self):
         # Paramètres de comportement
@@ -85,7 +95,9 @@ class Behavior:
         Recherche un partenaire compatible pour la reproduction
         parmi les créatures proches.
         """
-        potential_partners = []
+        candidates = []
+        distances = []
+        vision_range = creature.genome.phenotype.vision_range
         
         for other in nearby_creatures:
             if other == creature:
@@ -99,21 +111,25 @@ class Behavior:
             distance = np.sqrt((creature.x - other.x)**2 + (creature.y - other.y)**2)
             
             # Ne considérer que les créatures dans le rayon de vision
-            if distance > creature.genome.get_vision_range():
+            if distance > vision_range:
                 continue
-                
-            # Évaluer la compatibilité génétique (pour éviter la consanguinité)
-            compatibility = self.assess_genetic_compatibility(creature.genome, other.genome)
             
-            potential_partners.append((other, compatibility, distance))
+            candidates.append(other)
+            distances.append(distance)
         
         # Si des partenaires potentiels ont été trouvés
-        if potential_partners:
-            # Trier par compatibilité et distance
-            potential_partners.sort(key=lambda x: (x[1], -x[2]), reverse=True)
+        if candidates:
+            # Évaluer la compatibilité génétique (pour éviter la consanguinité) en une passe
+            compatibility = Behavior.compatibility_scores(
+                creature.genome.phenotype.genes,
+                np.array([other.genome.phenotype.genes for other in candidates])
+            )
+            
+            # Meilleure compatibilité, puis plus courte distance
+            best = np.lexsort((np.array(distances), -compatibility))[0]
             
             # Retourner le meilleur candidat
-            return potential_partners[0][0]
+            return candidates[best]
             
         return None
     
@@ -122,35 +138,37 @@ class Behavior:
         Évalue la compatibilité génétique entre deux génomes.
         Une valeur plus haute indique une meilleure compatibilité.
         """
-        # Calcul simple de la différence génétique
-        diff_sum = 0
-        trait_count = 0
-        
-        for trait in genome1.traits:
-            if trait in genome2.traits and not trait.startswith("color_"):
-                # Ne pas considérer les couleurs pour la compatibilité
-                if isinstance(genome1.traits[trait], bool):
-                    # Pour les traits booléens, différence binaire
-                    diff_sum += 0 if genome1.traits[trait] == genome2.traits[trait] else 1
-                else:
-                    # Pour les traits numériques, différence relative
-                    trait_diff = abs(genome1.traits[trait] - genome2.traits[trait])
-                    normalized_diff = trait_diff / 100 if trait_diff <= 100 else 1
-                    diff_sum += normalized_diff
-                
-                trait_count += 1
+        return float(Behavior.compatibility_scores(genome1.phenotype.genes, genome2.phenotype.genes))
+    
+    @staticmethod
+    def compatibility_scores(genes_a, genes_b):
+        """
+        Version vectorisée de assess_genetic_compatibility sur des vecteurs
+        de traits (Phenotype.genes). Les formes sont diffusées: paires alignées
+        (n, T) et (n, T), une créature contre plusieurs (T,) et (k, T), ou bloc
+        complet (n, 1, T) et (1, m, T).
+        """
+        genes_a = np.asarray(genes_a, dtype=float)[..., Behavior.COMPATIBILITY_COLUMNS]
+        genes_b = np.asarray(genes_b, dtype=float)[..., Behavior.COMPATIBILITY_COLUMNS]
         
-        if trait_count == 0:
-            return 0.5  # Valeur par défaut
+        # Différence binaire pour les booléens, relative (bornée à 1) pour les traits numériques
+        trait_diff = np.abs(genes_a - genes_b)
+        normalized_diff = np.where(Behavior.COMPATIBILITY_BOOLEAN, trait_diff > 0, np.minimum(trait_diff / 100, 1))
         
         # Différence moyenne normalisée (0 = identiques, 1 = complètement différents)
-        avg_diff = diff_sum / trait_count
+        avg_diff = normalized_diff.mean(axis=-1)
         
         # Convertir en compatibilité (0 = incompatibles, 1 = parfaitement compatibles)
         # Une différence modérée est préférable (ni trop similaire ni trop différent)
-        compatibility = 1.0 - abs(avg_diff - 0.3) * 2
+        compatibility = 1.0 - np.abs(avg_diff - 0.3) * 2
         
-        return max(0, min(1, compatibility))
+        return np.clip(compatibility, 0, 1)
+    
+    @staticmethod
+    def compatibility_matrix(genes):
+        """Compatibilité de chaque paire d'un bloc de créatures (matrice n x n)."""
+        genes = np.asarray(genes, dtype=float)
+        return Behavior.compatibility_scores(genes[:, None, :], genes[None, :, :])
     
     def should_migrate(self, creature):
         """
@@ -158,12 +176,11 @@ class Behavior:
         des conditions environnementales.
         """
         # Récupérer la cellule actuelle
-        cell_x, cell_y = int(creature.x), int(creature.y)
-        cell = creature.grid.get_cell(cell_x, cell_y)
+        cell = creature.grid.get_cell(int(creature.x), int(creature.y))
         
         if not cell:
             return False
-            
+        
         # Calculer l'adaptation environnementale
         env_fitness = creature.genome.calculate_environmental_fitness(cell)
         
@@ -218,7 +235,7 @@ class Behavior:
             return True
             
         # Chercher une meilleure cellule dans les environs
-        vision_range = creature.genome.get_vision_range()
+        vision_range = creature.genome.phenotype.vision_range
         best_cell = None
         best_value = 0
         
@@ -255,95 +272,91 @@ class Behavior:
         Met à jour le comportement de groupe des créatures.
         Implémente des comportements simples de groupe comme le rassemblement.
         """
+        if not creatures:
+            return
+        
         # Identifier les groupes de créatures proches
-        groups = self.identify_groups(creatures)
+        labels = self.identify_groups(creatures)
+        group_sizes = np.bincount(labels)
         
-        # Pour chaque groupe
-        for group in groups:
-            if len(group) < 3:
-                continue  # Ignorer les petits groupes
-                
-            # Identifier l'espèce dominante dans le groupe
-            species_counts = {}
-            for creature in group:
-                # Classification simple par taille et vitesse
-                size_class = "small" if creature.genome.traits["size"] < 50 else "large"
-                speed_class = "slow" if creature.genome.traits["speed"] < 50 else "fast"
-                species_key = f"{size_class}_{speed_class}"
-                
-                if species_key not in species_counts:
-                    species_counts[species_key] = 0
-                species_counts[species_key] += 1
-                
-            # Espèce dominante
-            dominant_species = max(species_counts, key=species_counts.get)
-            
-            # Ajuster le comportement en fonction de l'espèce dominante
-            for creature in group:
-                size_class = "small" if creature.genome.traits["size"] < 50 else "large"
-                speed_class = "slow" if creature.genome.traits["speed"] < 50 else "fast"
-                creature_species = f"{size_class}_{speed_class}"
-                
-                if creature_species == dominant_species:
-                    # Ajuster le comportement des membres de l'espèce dominante
-                    # Ex: augmenter légèrement l'agressivité en groupe
-                    if np.random.random() < 0.1 and creature.state == self.EXPLORING:
-                        creature.state = self.HUNTING
-                else:
-                    # Ajuster le comportement des autres espèces
-                    # Ex: tendance à fuir si en infériorité numérique
-                    if np.random.random() < 0.2 and creature.state != self.FLEEING:
-                        creature.state = self.FLEEING
-                        # Fuir le centre du groupe
-                        center_x = sum(c.x for c in group) / len(group)
-                        center_y = sum(c.y for c in group) / len(group)
-                        creature.target = (center_x, center_y)
+        # Ignorer les petits groupes
+        in_group = group_sizes[labels] >= 3
+        if not in_group.any():
+            return
+        
+        # Classification simple par taille et vitesse (0-3: small/large x slow/fast)
+        genes = np.array([c.genome.phenotype.genes for c in creatures])
+        species = (genes[:, Phenotype.INDEX["size"]] >= 50) * 2 + (genes[:, Phenotype.INDEX["speed"]] >= 50)
+        
+        # Espèce dominante de chaque groupe (comptage groupé)
+        group_count = len(group_sizes)
+        species_counts = np.bincount(labels * 4 + species, minlength=group_count * 4).reshape(group_count, 4)
+        dominant = species_counts.argmax(axis=1)
+        
+        # Centre de chaque groupe
+        x = np.array([c.x for c in creatures], dtype=float)
+        y = np.array([c.y for c in creatures], dtype=float)
+        center_x = np.bincount(labels, weights=x) / group_sizes
+        center_y = np.bincount(labels, weights=y) / group_sizes
+        
+        # Ajuster le comportement en fonction de l'espèce dominante
+        states = np.array([c.state for c in creatures])
+        rolls = np.random.random(len(creatures))
+        is_dominant = species == dominant[labels]
+        
+        # Membres de l'espèce dominante: augmenter légèrement l'agressivité en groupe
+        hunters = in_group & is_dominant & (rolls < 0.1) & (states == self.EXPLORING)
+        for i in np.flatnonzero(hunters).tolist():
+            creatures[i].state = self.HUNTING
+        
+        # Autres espèces: tendance à fuir si en infériorité numérique
+        fleeing = in_group & ~is_dominant & (rolls < 0.2) & (states != self.FLEEING)
+        for i in np.flatnonzero(fleeing).tolist():
+            creatures[i].state = self.FLEEING
+            # Fuir le centre du groupe
+            creatures[i].target = (center_x[labels[i]], center_y[labels[i]])
     
     def identify_groups(self, creatures):
         """
         Identifie les groupes de créatures basés sur la proximité.
-        Utilise un algorithme de clustering spatial simple.
+        Deux créatures à moins de group_distance sont reliées; un groupe est
+        une composante connexe. Retourne le numéro de groupe de chaque créature.
         """
         if not creatures:
-            return []
-            
-        # Initialiser les groupes
-        groups = []
-        processed = set()
+            return np.zeros(0, dtype=np.int64)
         
-        for creature in creatures:
-            if creature in processed:
-                continue
-                
-            # Nouvelle créature, nouveau groupe
-            current_group = [creature]
-            processed.add(creature)
-            
-            # Chercher des créatures proches de façon récursive
-            self._expand_group(creature, creatures, current_group, processed)
-            
-            # Ajouter le groupe s'il contient au moins une créature
-            if current_group:
-                groups.append(current_group)
-                
-        return groups
+        # Paires proches via l'index spatial (distance incluse)
+        radius = np.nextafter(float(self.group_distance), np.inf)
+        index = SpatialIndex([c.x for c in creatures], [c.y for c in creatures], radius)
+        first, second = index.pairs(radius)
+        
+        return Behavior.connected_components(len(creatures), first, second)
     
-    def _expand_group(self, creature, all_creatures, current_group, processed, depth=0):
+    @staticmethod
+    def connected_components(count, first, second):
         """
-        Fonction récursive pour étendre un groupe en incluant les créatures proches.
+        Union-find vectorisé: composantes connexes d'un graphe de count sommets
+        et d'arêtes (first, second). Retourne des numéros de 0 à k-1.
         """
-        if depth > 5:  # Limite de récursion pour éviter les problèmes de performance
-            return
-            
-        for other in all_creatures:
-            if other in processed:
-                continue
-                
-            # Calculer la distance
-            distance = np.sqrt((creature.x - other.x)**2 + (creature.y - other.y)**2)
+        parent = np.arange(count)
+        
+        while True:
+            # Accrocher la racine la plus grande de chaque arête à la plus petite
+            root_first = parent[first]
+            root_second = parent[second]
+            low = np.minimum(root_first, root_second)
+            high = np.maximum(root_first, root_second)
+            linked = low != high
+            if not linked.any():
+                break
+            np.minimum.at(parent, high[linked], low[linked])
             
-            # Si assez proche, ajouter au groupe et continuer la récursion
-            if distance <= self.group_distance:
-                current_group.append(other)
-                processed.add(other)
-                self._expand_group(other, all_creatures, current_group, processed, depth + 1)
\ No newline at end of file
+            # Compression des chemins jusqu'aux racines
+            while True:
+                grandparent = parent[parent]
+                if np.array_equal(grandparent, parent):
+                    break
+                parent = grandparent
+        
+        # Numéros de groupe consécutifs
+        return np.unique(parent, return_inverse=True)[1]
@@ -1,6 +1,8 @@
+import itertools
 import numpy as np
 import pygame
 from creatures.genome import Genome
+from world.cell import Cell
 from config import Config
 
 class Creature:
@@ -8,7 +10,27 @@ class Creature:
     Représente une créature autonome dans la simulation.
     Possède un génome, un comportement et interagit avec l'environnement.
     """
+    __slots__ = (
+        "id", "parents", "birth_tick", "row", "grid", "x", "y", "genome",
+        "energy", "health", "age", "max_age", "reproduction_cooldown",
+        "target", "direction", "state", "meals",
+    )
+    
+    # Compteur d'identifiants uniques (clé stable pour départager les créatures)
+    _ids = itertools.count(1)
+    
     def __init__(self, grid, x, y, genome=None):
+        self.reset(grid, x, y, genome)
+    
+    def reset(self, grid, x, y, genome=None):
+        """
+        (Ré)initialise complètement l'état de la créature.
+        Utilisé à la création et lors du recyclage par CreaturePool.
+        """
+        self.id = next(Creature._ids)
+        self.parents = (0, 0)      # Identifiants des parents (0 = population initiale)
+        self.birth_tick = 0        # Frame de naissance (fixée par Population)
+        self.row = -1              # Ligne dans le registre de la population (-1 = hors population)
         self.grid = grid
         self.x = x  # Position x dans la grille (peut être à virgule flottante)
         self.y = y  # Position y dans la grille (peut être à virgule flottante)
@@ -27,12 +49,29 @@ class Creature:
         self.target = None         # Cible actuelle (nourriture, partenaire...)
         self.direction = (0, 0)    # Direction de déplacement
         self.state = "exploring"   # État comportemental (exploring, hunting, fleeing...)
+        self.meals = 0             # Repas demandés, résolus en fin de frame
     
     def update(self):
         """Met à jour l'état de la créature à chaque frame."""
+        self.act()
+        
+        # Vérification de la mort (âge, énergie ou santé)
+        if self.is_dead():
+            return False  # La créature est morte
+        
+        return True  # La créature est vivante
+    
+    def act(self):
+        """
+        Vieillissement, décision et exécution du comportement, sans
+        vérification de la mort: la population résout d'abord les repas
+        demandés pendant la frame, puis vérifie la mort (voir Population.update).
+        """
+        self.meals = 0
+        
         # Vieillissement et consommation d'énergie
         self.age += 1 / Config.DAY_LENGTH  # Incrémenter l'âge d'une fraction de jour
-        self.energy -= self.genome.get_metabolic_rate() * 0.1  # Consommation d'énergie de base
+        self.energy -= self.genome.phenotype.metabolic_rate * 0.1  # Consommation d'énergie de base
         
         # Mise à jour des cooldowns
         if self.reproduction_cooldown > 0:
@@ -43,12 +82,6 @@ class Creature:
         
         # Exécution du comportement actuel
         self.execute_behavior()
-        
-        # Vérification de la mort (âge, énergie ou santé)
-        if self.is_dead():
-            return False  # La créature est morte
-            
-        return True  # La créature est vivante
     
     def decide_behavior(self):
         """Décide du comportement de la créature en fonction de son état."""
@@ -83,7 +116,7 @@ class Creature:
     
     def move(self):
         """Déplace la créature dans sa direction actuelle."""
-        speed = self.genome.get_speed()
+        speed = self.genome.phenotype.speed
         
         # Si pas de direction définie, en choisir une aléatoire
         if self.direction == (0, 0):
@@ -96,11 +129,11 @@ class Creature:
         # Vérification des limites du monde
         if 0 <= new_x < self.grid.width and 0 <= new_y < self.grid.height:
             # Vérifier si la créature peut se déplacer dans ce type de terrain
-            cell = self.grid.get_cell(int(new_x), int(new_y))
-            if cell.terrain_type == "water" and not self.genome.traits["can_swim"]:
+            terrain_type = Cell.TERRAIN_TYPES[self.grid.terrain[int(new_x), int(new_y)]]
+            if terrain_type == "water" and not self.genome.traits["can_swim"]:
                 # La créature ne peut pas nager, changer de direction
                 self.set_random_direction()
-            elif cell.terrain_type == "mountain" and not self.genome.traits["can_climb"]:
+            elif terrain_type == "mountain" and not self.genome.traits["can_climb"]:
                 # La créature ne peut pas grimper, changer de direction
                 self.set_random_direction()
             else:
@@ -116,7 +149,7 @@ class Creature:
                     "mountain": 0.3 if self.genome.traits["can_climb"] else 0.6
                 }
                 
-                energy_cost = speed * terrain_cost.get(cell.terrain_type, 0.2)
+                energy_cost = speed * terrain_cost.get(terrain_type, 0.2)
                 self.energy -= energy_cost
         else:
             # Rebondir aux limites du monde
@@ -129,40 +162,36 @@ class Creature:
     
     def find_food(self):
         """Cherche de la nourriture dans le rayon de vision."""
-        vision_range = self.genome.get_vision_range()
-        best_food_cell = None
-        best_food_value = 0
-        
-        # Parcourir les cellules dans le rayon de vision
-        for dx in range(-vision_range, vision_range + 1):
-            for dy in range(-vision_range, vision_range + 1):
-                cell_x, cell_y = int(self.x) + dx, int(self.y) + dy
-                
-                # Vérifier les limites de la grille
-                if 0 <= cell_x < self.grid.width and 0 <= cell_y < self.grid.height:
-                    cell = self.grid.get_cell(cell_x, cell_y)
-                    
-                    # Calculer la distance
-                    distance = np.sqrt(dx**2 + dy**2)
-                    if distance > vision_range:
-                        continue
-                    
-                    # Si la cellule contient de la nourriture
-                    if cell.food > 0:
-                        # Évaluer l'attractivité de cette source de nourriture
-                        food_value = cell.food / (distance + 1)
-                        
-                        # Tenir compte de l'adaptation environnementale
-                        env_fitness = self.genome.calculate_environmental_fitness(cell)
-                        food_value *= env_fitness
-                        
-                        if food_value > best_food_value:
-                            best_food_value = food_value
-                            best_food_cell = (cell_x, cell_y)
-        
-        # Si de la nourriture a été trouvée, la définir comme cible
-        if best_food_cell:
-            self.target = best_food_cell
+        vision_range = self.genome.phenotype.vision_range
+        cell_x, cell_y = int(self.x), int(self.y)
+        
+        # Fenêtre des cellules dans le rayon de vision (bornée par la grille)
+        x0, x1 = max(0, cell_x - vision_range), min(self.grid.width, cell_x + vision_range + 1)
+        y0, y1 = max(0, cell_y - vision_range), min(self.grid.height, cell_y + vision_range + 1)
+        if x0 >= x1 or y0 >= y1:
+            self.state = "exploring"
+            return
+        
+        # Distances au centre de la fenêtre
+        dx = np.arange(x0, x1) - cell_x
+        dy = np.arange(y0, y1) - cell_y
+        distance = np.sqrt(dx[:, None] ** 2 + dy[None, :] ** 2)
+        
+        # Attractivité de chaque source de nourriture, pondérée par l'adaptation environnementale
+        food = self.grid.food[x0:x1, y0:y1]
+        env_fitness = Genome.environmental_fitness(
+            self.genome.phenotype.genes,
+            self.grid.terrain[x0:x1, y0:y1],
+            self.grid.temperature[x0:x1, y0:y1]
+        )
+        visible = (food > 0) & (distance <= vision_range)
+        food_value = np.where(visible, food / (distance + 1) * env_fitness, 0.0)
+        
+        # Meilleure cellule (première rencontrée en cas d'égalité)
+        best = np.argmax(food_value)
+        if food_value.flat[best] > 0:
+            best_x, best_y = np.unravel_index(best, food_value.shape)
+            self.target = (x0 + int(best_x), y0 + int(best_y))
         else:
             # Pas de nourriture trouvée, continuer à explorer
             self.state = "exploring"
@@ -190,24 +219,14 @@ class Creature:
         self.move()
     
     def eat(self):
-        """Tente de manger de la nourriture à la position actuelle."""
-        cell_x, cell_y = int(self.x), int(self.y)
-        cell = self.grid.get_cell(cell_x, cell_y)
-        
-        if cell and cell.food > 0:
-            # Manger la nourriture
-            food_eaten = min(cell.food, 5)  # Manger au maximum 5 unités de nourriture
-            cell.food -= food_eaten
-            
-            # Gain d'énergie
-            self.energy += food_eaten * 5
-            
-            # Limiter l'énergie maximale
-            self.energy = min(self.energy, 100)
-            
-            # Réinitialiser la cible
-            self.target = None
-            self.state = "exploring"
+        """
+        Demande à manger la nourriture de la cellule actuelle.
+        Le repas est résolu pour toute la population en fin de frame
+        (Population.resolve_feeding), afin que les créatures d'une même
+        cellule se partagent la nourriture de façon déterministe; chaque
+        appel pendant la frame ajoute un repas à la demande.
+        """
+        self.meals += 1
     
     def flee(self):
         """Fuite face à un danger."""
@@ -224,7 +243,7 @@ class Creature:
         
         # Se déplacer plus rapidement en fuyant
         speed_boost = 1.5
-        speed = self.genome.get_speed() * speed_boost
+        speed = self.genome.phenotype.speed * speed_boost
         
         new_x = self.x + self.direction[0] * speed
         new_y = self.y + self.direction[1] * speed
@@ -245,14 +264,12 @@ class Creature:
             self.age > 3  # Avoir atteint un âge minimal
         )
     
-    def reproduce(self, partner):
+    def reproduce(self, partner, pool=None):
         """
         Effectue la reproduction avec un partenaire.
-        Retourne un nouvel objet Creature issu du croisement des génomes.
+        Retourne un nouvel objet Creature issu du croisement des génomes,
+        recyclé depuis pool (CreaturePool) si fourni.
         """
-        # Création du génome de l'enfant par croisement
-        child_genome = Genome.crossover(self.genome, partner.genome)
-        
         # Position de l'enfant (près des parents)
         child_x = (self.x + partner.x) / 2 + np.random.uniform(-1, 1)
         child_y = (self.y + partner.y) / 2 + np.random.uniform(-1, 1)
@@ -261,8 +278,15 @@ class Creature:
         child_x = max(0, min(self.grid.width - 1, child_x))
         child_y = max(0, min(self.grid.height - 1, child_y))
         
-        # Création de la nouvelle créature
-        child = Creature(self.grid, child_x, child_y, child_genome)
+        # Création de la nouvelle créature (génome de l'enfant par croisement)
+        if pool is not None:
+            child = pool.acquire_offspring(self.grid, child_x, child_y, self.genome, partner.genome)
+        else:
+            child_genome = Genome.crossover(self.genome, partner.genome)
+            child = Creature(self.grid, child_x, child_y, child_genome)
+        
+        # Filiation
+        child.parents = (self.id, partner.id)
         
         # Épuisement des parents après la reproduction
         self.energy -= 30
@@ -282,17 +306,24 @@ class Creature:
             self.age >= self.max_age  # Mort de vieillesse
         )
     
+    def cause_of_death(self):
+        """Retourne la cause de la mort (starvation, injuries ou old_age)."""
+        if self.energy <= 0:
+            return "starvation"
+        if self.health <= 0:
+            return "injuries"
+        return "old_age"
+    
     def draw(self, surface, offset_x=0, offset_y=0, cell_size=Config.CELL_SIZE):
         """Dessine la créature sur une surface pygame."""
         # Calculer la position à l'écran
         screen_x = int(self.x * cell_size) + offset_x
         screen_y = int(self.y * cell_size) + offset_y
         
-        # Taille de la créature basée sur son génome
-        size = int(self.genome.get_size())
-        
-        # Couleur de la créature basée sur son génome
-        color = self.genome.get_color()
+        # Taille et couleur de la créature basées sur son phénotype
+        phenotype = self.genome.phenotype
+        size = int(phenotype.size)
+        color = phenotype.color
         
         # Dessiner le corps de la créature
         pygame.draw.circle(surface, color, (screen_x, screen_y), size)
@@ -2,122 +2,133 @@ import pygame
 import numpy as np
 from config import Config
 from simulation.statistics import Statistics
+from creatures.genome import Genome
+from creatures.selection import Selection
 
 class Evolution:
     """
     Gère les mécanismes d'évolution dans la simulation.
     Implémente les algorithmes de sélection naturelle, mutation et adaptation.
     """
-    def __init__(self, grid):
+    # Nombre maximal de candidats tirés à la fois pour les tournois
+    TOURNAMENT_BLOCK = 1 << 20
+    
+    def __init__(self, grid, statistics=None):
         self.grid = grid
-        self.statistics = Statistics()
+        self.statistics = statistics or Statistics()
         
         # Paramètres d'évolution
         self.mutation_rate = Config.MUTATION_RATE
         self.crossover_rate = Config.CROSSOVER_RATE
         self.selection_pressure = Config.SELECTION_PRESSURE
+        self.selection_method = Config.SELECTION_METHOD
+        self.selection = Selection(self.selection_method, self.selection_pressure)
         
         # Tracker d'adaptation environnementale
         self.adaptation_map = np.zeros((grid.width, grid.height), dtype=float)
         self.update_adaptation_map()
     
-    def select_parents(self, population):
+    def select_parents(self, population, num_pairs=1, fitness=None):
         """
-        Sélectionne des parents pour la reproduction en utilisant
-        une sélection par tournoi avec pression de sélection.
+        Sélectionne num_pairs couples de parents (indices de créatures) en
+        utilisant une sélection par tournoi avec pression de sélection, ou
+        l'opérateur de Config.SELECTION_METHOD.
+        Tous les tournois sont tirés en une passe, sous forme de matrices d'indices.
+        fitness est le tableau de fitness de la population (calculé s'il est absent).
         """
-        if len(population.creatures) < 2:
-            return None, None
+        num_creatures = len(population.creatures)
+        if num_creatures < 2 or num_pairs <= 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
         
-        # Taille du tournoi (nombre de créatures à comparer)
-        tournament_size = max(2, int(len(population.creatures) * 0.1))
+        if fitness is None:
+            fitness = self.calculate_fitness(population)
         
-        # Sélection du premier parent - utiliser toList() pour convertir en liste Python
-        candidates1 = np.random.choice(
-            population.creatures, 
-            size=min(tournament_size, len(population.creatures)), 
-            replace=False
-        ).tolist()
+        if self.selection_method != "tournament":
+            return self._select_pairs(fitness, num_pairs)
         
-        parent1 = self._select_fittest(candidates1)
+        # Appliquer la pression de sélection
+        weights = fitness ** self.selection_pressure
         
-        # Sélection du second parent (différent du premier)
-        remaining = [c for c in population.creatures if c != parent1]
-        if not remaining:
-            return parent1, np.random.choice(population.creatures)
+        # Taille du tournoi (nombre de créatures à comparer)
+        tournament_size = min(max(2, int(num_creatures * 0.1)), num_creatures - 1)
         
-        candidates2 = np.random.choice(
-            remaining,
-            size=min(tournament_size, len(remaining)),
-            replace=False
-        ).tolist()
+        # Tournois traités par blocs pour borner la mémoire
+        block = max(1, Evolution.TOURNAMENT_BLOCK // tournament_size)
+        parents1 = np.empty(num_pairs, dtype=np.int64)
+        parents2 = np.empty(num_pairs, dtype=np.int64)
         
-        parent2 = self._select_fittest(candidates2)
+        for start in range(0, num_pairs, block):
+            rows = min(block, num_pairs - start)
+            
+            # Sélection du premier parent (une ligne de candidats par tournoi)
+            candidates1 = np.random.randint(num_creatures, size=(rows, tournament_size))
+            first = self._select_fittest(candidates1, weights)
+            
+            # Sélection du second parent parmi les autres créatures
+            # (indices décalés au-delà du premier parent pour l'exclure)
+            candidates2 = np.random.randint(num_creatures - 1, size=(rows, tournament_size))
+            candidates2 += candidates2 >= first[:, None]
+            
+            parents1[start:start + rows] = first
+            parents2[start:start + rows] = self._select_fittest(candidates2, weights)
         
-        return parent1, parent2
+        return parents1, parents2
     
-    def _select_fittest(self, candidates):
+    def _select_pairs(self, fitness, num_pairs):
         """
-        Sélectionne la créature la plus adaptée parmi les candidats,
-        en tenant compte de la pression de sélection.
+        Forme les couples à partir des indices tirés par l'opérateur de sélection.
+        Les couples formés deux fois de la même créature sont écartés.
         """
-        # Vérifier si la liste des candidats est vide en utilisant len()
-        if len(candidates) == 0:
-            return None
-        
-        # Calculer le fitness de chaque candidat
-        fitness_scores = []
-        for creature in candidates:
-            # Combiner plusieurs facteurs pour le fitness
-            fitness = self._calculate_fitness(creature)
-            fitness_scores.append(fitness)
-        
-        # Appliquer la pression de sélection
-        selection_probs = np.array(fitness_scores) ** self.selection_pressure
-        sum_probs = np.sum(selection_probs)
-        
-        # Éviter la division par zéro
-        if sum_probs <= 0:
-            # Si toutes les probabilités sont nulles, sélectionner aléatoirement
-            return np.random.choice(candidates)
+        selected = self.selection.select(fitness, num_pairs * 2)
+        parents1 = selected[:num_pairs]
+        parents2 = selected[num_pairs:]
         
-        # Normaliser les probabilités
-        selection_probs = selection_probs / sum_probs
+        distinct = parents1 != parents2
+        return parents1[distinct], parents2[distinct]
+    
+    def _select_fittest(self, candidates, weights):
+        """
+        Sélectionne le vainqueur de chaque tournoi (une ligne d'indices de
+        candidats), avec une probabilité proportionnelle à son poids.
+        """
+        # Tirage pondéré sur chaque ligne par sommes cumulées
+        cumulative = np.cumsum(weights[candidates], axis=1)
+        draws = np.random.random(len(candidates)) * cumulative[:, -1]
+        winners = np.minimum((cumulative <= draws[:, None]).sum(axis=1), candidates.shape[1] - 1)
         
-        try:
-            # Sélection probabiliste basée sur le fitness
-            selected_index = np.random.choice(len(candidates), p=selection_probs)
-            return candidates[selected_index]
-        except ValueError:
-            # Fallback en cas d'erreur (probas invalides, etc.)
-            return np.random.choice(candidates)
+        return candidates[np.arange(len(candidates)), winners]
     
-    def _calculate_fitness(self, creature):
+    def calculate_fitness(self, population, rows=None):
         """
-        Calcule la valeur d'adaptation (fitness) d'une créature.
+        Calcule la valeur d'adaptation (fitness) des créatures d'indices rows
+        (toute la population par défaut) sous forme de tableau.
         Combine plusieurs facteurs: énergie, santé, âge et adaptation environnementale.
         """
+        if rows is None:
+            creatures = population.creatures
+        else:
+            creatures = [population.creatures[i] for i in rows]
+        
         # Facteurs de base
-        energy_factor = creature.energy / 100
-        health_factor = creature.health / 100
+        energy_factor = np.array([c.energy for c in creatures], dtype=float) / 100
+        health_factor = np.array([c.health for c in creatures], dtype=float) / 100
         
         # Facteur d'âge (préférence pour les créatures matures mais pas trop vieilles)
-        age_ratio = creature.age / creature.max_age
-        age_factor = 1.0
-        if age_ratio < 0.2:
-            # Jeunes créatures: fitness réduit
-            age_factor = 0.5 + age_ratio * 2.5
-        elif age_ratio > 0.7:
-            # Vieilles créatures: fitness diminue progressivement
-            age_factor = 1.0 - (age_ratio - 0.7) * 2
-        
-        # Facteur d'adaptation environnementale
-        cell_x, cell_y = int(creature.x), int(creature.y)
-        if 0 <= cell_x < self.grid.width and 0 <= cell_y < self.grid.height:
-            cell = self.grid.get_cell(cell_x, cell_y)
-            env_factor = creature.genome.calculate_environmental_fitness(cell)
-        else:
-            env_factor = 0.5  # Valeur par défaut
+        age_ratio = np.array([c.age / c.max_age for c in creatures], dtype=float)
+        age_factor = np.ones(len(creatures))
+        young = age_ratio < 0.2
+        old = age_ratio > 0.7
+        age_factor[young] = 0.5 + age_ratio[young] * 2.5
+        age_factor[old] = 1.0 - (age_ratio[old] - 0.7) * 2
+        
+        # Facteur d'adaptation environnementale (cellules lues dans l'index de la frame)
+        genes = np.array([c.genome.phenotype.genes for c in creatures]).reshape(len(creatures), -1)
+        env_factor = Genome.environmental_fitness(
+            genes,
+            population.gather("terrain", rows),
+            population.gather("temperature", rows)
+        )
         
         # Combinaison des facteurs (avec différentes pondérations)
         fitness = (
@@ -127,7 +138,7 @@ class Evolution:
             env_factor * 0.3
         )
         
-        return max(0.01, fitness)  # Garantir un fitness minimum positif
+        return np.maximum(0.01, fitness)  # Garantir un fitness minimum positif
     
     def perform_evolution(self, population):
         """
@@ -140,25 +151,28 @@ class Evolution:
         # Nombre de couples à former pour la reproduction
         num_pairs = len(population.creatures) // 3
         
+        # Fitness de la population, calculé une seule fois pour tous les tournois du jour
+        fitness = self.calculate_fitness(population) if num_pairs > 0 else None
+        
+        # Sélectionner tous les parents (toujours deux créatures distinctes)
+        parents1, parents2 = self.select_parents(population, num_pairs, fitness)
+        
         # Nouvelle génération de créatures
         new_creatures = []
+        creatures = population.creatures
         
-        for _ in range(num_pairs):
-            # Sélectionner les parents
-            parent1, parent2 = self.select_parents(population)
+        for index1, index2 in zip(parents1.tolist(), parents2.tolist()):
+            parent1 = creatures[index1]
+            parent2 = creatures[index2]
             
-            if parent1 and parent2 and parent1 != parent2:
-                # Vérifier si les parents sont prêts à se reproduire
-                if parent1.is_ready_to_reproduce() and parent2.is_ready_to_reproduce():
-                    # Créer un enfant par croisement des génomes
-                    child = parent1.reproduce(parent2)
-                    new_creatures.append(child)
+            # Vérifier si les parents sont prêts à se reproduire
+            if parent1.is_ready_to_reproduce() and parent2.is_ready_to_reproduce():
+                # Créer un enfant par croisement des génomes
+                child = parent1.reproduce(parent2, population.pool)
+                new_creatures.append(child)
         
         # Ajouter les nouveaux-nés à la population
-        population.creatures.extend(new_creatures)
-        
-        # Mettre à jour les statistiques
-        self.statistics.update_population_stats(population.generation, population)
+        population.add_creatures(new_creatures)
         
         return len(new_creatures)
     
@@ -176,65 +190,16 @@ class Evolution:
     def detect_speciation(self, population):
         """
         Détecte si la population a commencé à se diviser en espèces distinctes.
-        Utilise le clustering pour identifier les groupes génétiques.
+        Lit le regroupement partagé de la population (calculé une fois par génération).
         """
+        speciation = population.speciation
+        speciation.update(population)
+        
         # Seuil minimal de créatures pour la détection d'espèces
-        if len(population.creatures) < 10:
+        if speciation.cluster_labels is None:
             return 1, {}  # Une seule espèce
         
-        # Extraire les traits génétiques clés pour chaque créature
-        genetic_data = []
-        for creature in population.creatures:
-            genome = creature.genome.traits
-            
-            # Utiliser un sous-ensemble de traits pour la classification
-            traits = [
-                genome["size"],
-                genome["speed"],
-                genome["strength"],
-                genome["heat_tolerance"],
-                genome["cold_tolerance"],
-                genome["water_affinity"],
-                genome["mountain_affinity"],
-                1 if genome["can_swim"] else 0,
-                1 if genome["can_climb"] else 0
-            ]
-            genetic_data.append(traits)
-        
-        # Convertir en tableau numpy
-        data = np.array(genetic_data)
-        
-        # Nombre d'espèces potentielles (k-means clustering simplifié)
-        k = min(5, max(1, len(data) // 20))
-        
-        # Centres initiaux avec k créatures aléatoires
-        indices = np.random.choice(len(data), k, replace=False)
-        centers = data[indices]
-        
-        # Assigner chaque créature à une espèce
-        species = {}
-        for _ in range(5):  # Nombre d'itérations pour affiner les clusters
-            # Réinitialiser les clusters
-            clusters = [[] for _ in range(k)]
-            
-            # Assigner chaque créature au centre le plus proche
-            for i, traits in enumerate(data):
-                distances = [np.sum((traits - center) ** 2) for center in centers]
-                closest = np.argmin(distances)
-                clusters[closest].append(i)
-            
-            # Mettre à jour les centres
-            for i, cluster in enumerate(clusters):
-                if cluster:  # Éviter la division par zéro
-                    centers[i] = np.mean(data[cluster], axis=0)
-        
-        # Compter les créatures par espèce
-        species_counts = {i: len(clusters[i]) for i in range(k)}
-        
-        # Nombre d'espèces réelles (certains clusters peuvent être vides)
-        num_species = sum(1 for count in species_counts.values() if count > 0)
-        
-        return num_species, species_counts
+        return speciation.num_species, speciation.species_counts()
     
     def analyze_adaptation(self, population):
         """
@@ -249,34 +214,22 @@ class Evolution:
                 "habitat_preferences": {}
             }
         
-        # Initialiser les compteurs
-        adaptation_scores = []
-        habitat_counts = {
-            "water": 0,
-            "desert": 0,
-            "forest": 0,
-            "mountain": 0
-        }
+        # Adaptation de chaque créature à sa cellule actuelle
+        genes = np.array([c.genome.phenotype.genes for c in population.creatures])
+        adaptation_scores = Genome.environmental_fitness(
+            genes,
+            population.gather("terrain"),
+            population.gather("temperature")
+        )
         
-        # Analyser chaque créature
-        for creature in population.creatures:
-            cell_x, cell_y = int(creature.x), int(creature.y)
-            if 0 <= cell_x < self.grid.width and 0 <= cell_y < self.grid.height:
-                cell = self.grid.get_cell(cell_x, cell_y)
-                
-                # Évaluer l'adaptation de la créature à cette cellule
-                adaptation = creature.genome.calculate_environmental_fitness(cell)
-                adaptation_scores.append(adaptation)
-                
-                # Comptage des habitats
-                if cell.terrain_type in habitat_counts:
-                    habitat_counts[cell.terrain_type] += 1
+        # Comptage des habitats
+        habitat_counts = population.get_creatures_by_terrain()
         
         # Calculer les statistiques d'adaptation
-        if adaptation_scores:
-            avg_adaptation = sum(adaptation_scores) / len(adaptation_scores)
-            best_adaptation = max(adaptation_scores)
-            worst_adaptation = min(adaptation_scores)
+        if adaptation_scores.size:
+            avg_adaptation = float(np.mean(adaptation_scores))
+            best_adaptation = float(np.max(adaptation_scores))
+            worst_adaptation = float(np.min(adaptation_scores))
         else:
             avg_adaptation = best_adaptation = worst_adaptation = 0
         
@@ -1,20 +1,87 @@
 import numpy as np
 from config import Config
+from creatures.phenotype import Phenotype
+from world.cell import Cell
+
+class TraitDict(dict):
+    """
+    Dictionnaire de traits qui invalide le phénotype de son génome
+    à chaque modification.
+    """
+    __slots__ = ("_genome",)
+    
+    def __init__(self, genome, traits):
+        super().__init__(traits)
+        self._genome = genome
+    
+    def __setitem__(self, trait, value):
+        super().__setitem__(trait, value)
+        self._genome._phenotype = None
+    
+    def __delitem__(self, trait):
+        super().__delitem__(trait)
+        self._genome._phenotype = None
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._genome._phenotype = None
+    
+    def setdefault(self, trait, default=None):
+        self._genome._phenotype = None
+        return super().setdefault(trait, default)
+    
+    def pop(self, trait, *args):
+        self._genome._phenotype = None
+        return super().pop(trait, *args)
+    
+    def popitem(self):
+        self._genome._phenotype = None
+        return super().popitem()
+    
+    def clear(self):
+        super().clear()
+        self._genome._phenotype = None
 
 class Genome:
     """
     Représente le génome d'une créature, définissant ses traits et capacités.
     Gère les mécanismes de mutation et de croisement génétique.
     """
-    def __init__(self, parent_genome=None):
+    __slots__ = ("_traits", "_phenotype")
+    
+    def __init__(self, parent_genome=None, traits=None):
+        # Phénotype calculé à la demande puis mis en cache
+        self._phenotype = None
+        
         # Si un génome parent est fourni, effectuer une mutation
         if parent_genome:
             self.traits = parent_genome.traits.copy()
             self.mutate()
+        elif traits is not None:
+            # Traits fournis directement (pas de tirage aléatoire inutile)
+            self.traits = traits
         else:
             # Sinon, créer un génome aléatoire
             self.initialize_random()
     
+    @property
+    def traits(self):
+        """Traits génétiques de la créature."""
+        return self._traits
+    
+    @traits.setter
+    def traits(self, traits):
+        # Toute modification ultérieure des traits invalidera le phénotype
+        self._traits = TraitDict(self, traits)
+        self._phenotype = None
+    
+    @property
+    def phenotype(self):
+        """Valeurs dérivées du génome, recalculées seulement après un changement."""
+        if self._phenotype is None:
+            self._phenotype = Phenotype(self._traits)
+        return self._phenotype
+    
     def initialize_random(self):
         """Initialise un génome avec des valeurs aléatoires."""
         self.traits = {
@@ -68,16 +135,19 @@ class Genome:
                     self.traits[trait] = max(1, min(100, self.traits[trait]))
     
     @staticmethod
-    def crossover(genome1, genome2):
+    def crossover(genome1, genome2, child_genome=None):
         """
         Crée un nouveau génome par croisement de deux génomes parents.
         Utilise un croisement uniforme où chaque trait est pris de l'un des parents.
+        Si child_genome est fourni (génome recyclé), il est réécrit sur place.
         """
-        child_genome = Genome()
+        if child_genome is None:
+            child_genome = Genome(traits=genome1.traits)
         
-        for trait in genome1.traits:
-            # Pour chaque trait, choisir aléatoirement l'un des parents
-            if np.random.random() < 0.5:
+        # Pour chaque trait, choisir aléatoirement l'un des parents (un seul tirage)
+        from_first = (np.random.random(len(genome1.traits)) < 0.5).tolist()
+        for trait, first in zip(genome1.traits, from_first):
+            if first:
                 child_genome.traits[trait] = genome1.traits[trait]
             else:
                 child_genome.traits[trait] = genome2.traits[trait]
@@ -90,50 +160,62 @@ class Genome:
     
     def get_color(self):
         """Récupère la couleur RGB définie par le génome."""
-        return (self.traits["color_r"], self.traits["color_g"], self.traits["color_b"])
+        return self.phenotype.color
     
     def get_size(self):
         """Récupère la taille visuelle basée sur le trait de taille."""
-        # Conversion du trait de taille (1-100) en pixels (min-max)
-        return Config.CREATURE_MIN_SIZE + (self.traits["size"] / 100) * (Config.CREATURE_MAX_SIZE - Config.CREATURE_MIN_SIZE)
+        return self.phenotype.size
     
     def get_speed(self):
         """Récupère la vitesse de déplacement en cellules par frame."""
-        # Conversion du trait de vitesse (1-100) en vitesse réelle
-        return 0.05 + (self.traits["speed"] / 100) * 0.2
+        return self.phenotype.speed
     
     def get_vision_range(self):
         """Récupère la portée de vision en nombre de cellules."""
-        # Conversion du trait de vision (1-100) en cellules
-        return 1 + int((self.traits["vision_range"] / 100) * 7)
+        return self.phenotype.vision_range
     
     def get_metabolic_rate(self):
         """Récupère le taux métabolique (consommation d'énergie)."""
-        # Un métabolisme élevé consomme plus d'énergie
-        return 0.8 + (self.traits["metabolism"] / 100) * 1.8
+        return self.phenotype.metabolic_rate
     
     def calculate_environmental_fitness(self, cell):
         """
         Calcule l'adaptation de la créature à un environnement spécifique.
         Retourne une valeur de 0 (très mal adapté) à 1 (parfaitement adapté).
+        Les règles sont celles de environmental_fitness, appliquée à une seule cellule.
         """
+        return float(Genome.environmental_fitness(self.phenotype.genes, cell.terrain_code, cell.temperature))
+    
+    @staticmethod
+    def environmental_fitness(genes, terrain, temperature):
+        """
+        Version vectorisée de calculate_environmental_fitness.
+        genes contient des vecteurs de traits (Phenotype.genes), terrain des codes
+        de terrain et temperature des températures; les formes sont diffusées:
+        - un à un: genes (n, T) avec terrain et temperature (n,)
+        - un à plusieurs: genes (T,) avec terrain et temperature (k,) ou (a, b)
+        """
+        genes = np.asarray(genes, dtype=float)
+        terrain = np.asarray(terrain)
+        temperature = np.asarray(temperature, dtype=float)
+        index = Phenotype.INDEX
+        
+        def trait(name):
+            return genes[..., index[name]]
+        
         fitness = 0.5  # Valeur de base
         
         # Adaptation au type de terrain
-        if cell.terrain_type == "water":
-            fitness += 0.3 if self.traits["can_swim"] else -0.3
-            fitness += (self.traits["water_affinity"] - 50) / 100
-        elif cell.terrain_type == "mountain":
-            fitness += 0.3 if self.traits["can_climb"] else -0.2
-            fitness += (self.traits["mountain_affinity"] - 50) / 100
+        water = terrain == Cell.TERRAIN_CODES["water"]
+        mountain = terrain == Cell.TERRAIN_CODES["mountain"]
+        water_bonus = np.where(trait("can_swim") > 0.5, 0.3, -0.3) + (trait("water_affinity") - 50) / 100
+        mountain_bonus = np.where(trait("can_climb") > 0.5, 0.3, -0.2) + (trait("mountain_affinity") - 50) / 100
+        fitness = fitness + np.where(water, water_bonus, np.where(mountain, mountain_bonus, 0.0))
         
         # Adaptation à la température
-        if cell.temperature > 30:  # Environnement chaud
-            fitness += (self.traits["heat_tolerance"] - 50) / 100
-        elif cell.temperature < 10:  # Environnement froid
-            fitness += (self.traits["cold_tolerance"] - 50) / 100
-        
-        # Normaliser le résultat entre 0 et 1
-        fitness = max(0.1, min(1.0, fitness))
+        heat_bonus = (trait("heat_tolerance") - 50) / 100
+        cold_bonus = (trait("cold_tolerance") - 50) / 100
+        fitness = fitness + np.where(temperature > 30, heat_bonus, np.where(temperature < 10, cold_bonus, 0.0))
         
-        return fitness
\ No newline at end of file
+        # Normaliser le résultat entre 0.1 et 1
+        return np.clip(fitness, 0.1, 1.0)
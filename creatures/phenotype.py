@@ -0,0 +1,41 @@
+import numpy as np
+from config import Config
+
+class Phenotype:
+    """
+    Valeurs dérivées du génome (taille, vitesse, vision, métabolisme, couleur).
+    Calculées une seule fois à la naissance ou après une mutation, puis lues
+    directement par les créatures à chaque frame.
+    """
+    __slots__ = ("size", "speed", "vision_range", "metabolic_rate", "color", "genes")
+    
+    # Ordre des traits dans le vecteur génétique compact
+    TRAITS = (
+        "size", "speed", "strength", "vision_range",
+        "metabolism", "aggression", "reproduction_rate", "social_tendency",
+        "heat_tolerance", "cold_tolerance", "water_affinity", "mountain_affinity",
+        "can_swim", "can_climb",
+        "color_r", "color_g", "color_b",
+    )
+    INDEX = {trait: i for i, trait in enumerate(TRAITS)}
+    BOOLEAN_TRAITS = ("can_swim", "can_climb")
+    COLOR_TRAITS = ("color_r", "color_g", "color_b")
+    
+    def __init__(self, traits):
+        # Conversion du trait de taille (1-100) en pixels (min-max)
+        self.size = Config.CREATURE_MIN_SIZE + (traits["size"] / 100) * (Config.CREATURE_MAX_SIZE - Config.CREATURE_MIN_SIZE)
+        
+        # Conversion du trait de vitesse (1-100) en cellules par frame
+        self.speed = 0.05 + (traits["speed"] / 100) * 0.2
+        
+        # Conversion du trait de vision (1-100) en nombre de cellules
+        self.vision_range = 1 + int((traits["vision_range"] / 100) * 7)
+        
+        # Un métabolisme élevé consomme plus d'énergie
+        self.metabolic_rate = 0.8 + (traits["metabolism"] / 100) * 1.8
+        
+        # Couleur RGB
+        self.color = (traits["color_r"], traits["color_g"], traits["color_b"])
+        
+        # Vecteur des traits (booléens en 0/1) pour les calculs vectorisés
+        self.genes = np.array([float(traits[trait]) for trait in Phenotype.TRAITS])
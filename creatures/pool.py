@@ -0,0 +1,49 @@
+from config import Config
+from creatures.creature import Creature
+from creatures.genome import Genome
+
+class CreaturePool:
+    """
+    Réserve de créatures mortes réutilisées pour les nouveau-nés.
+    Évite d'allouer une créature et un génome à chaque naissance:
+    l'instance recyclée et son génome sont réinitialisés sur place.
+    """
+    def __init__(self, max_size=None):
+        # Taille maximale de la réserve (par défaut la population maximale)
+        self.max_size = max_size if max_size is not None else Config.MAX_POPULATION
+        self.free = []
+    
+    def release(self, creature):
+        """Rend une créature morte à la réserve."""
+        if len(self.free) < self.max_size:
+            # Ne pas garder de référence vers la grille ou une cible
+            creature.grid = None
+            creature.target = None
+            self.free.append(creature)
+    
+    def release_all(self, creatures):
+        """Rend plusieurs créatures mortes à la réserve."""
+        for creature in creatures:
+            self.release(creature)
+    
+    def acquire(self, grid, x, y, genome=None):
+        """Récupère une créature réinitialisée (recyclée si possible)."""
+        if self.free:
+            creature = self.free.pop()
+            creature.reset(grid, x, y, genome)
+            return creature
+        
+        return Creature(grid, x, y, genome)
+    
+    def acquire_offspring(self, grid, x, y, genome1, genome2):
+        """
+        Récupère un nouveau-né issu du croisement de genome1 et genome2.
+        Le génome de la créature recyclée est réécrit sur place.
+        """
+        if self.free:
+            creature = self.free.pop()
+            Genome.crossover(genome1, genome2, creature.genome)
+            creature.reset(grid, x, y, creature.genome)
+            return creature
+        
+        return Creature(grid, x, y, Genome.crossover(genome1, genome2))
@@ -0,0 +1,84 @@
+import numpy as np
+from config import Config
+
+class Selection:
+    """
+    Opérateurs de sélection sur des tableaux de fitness.
+    Chaque opérateur tire en une passe les indices de tous les parents d'une
+    journée (un indice peut être tiré plusieurs fois).
+    """
+    # Opérateurs disponibles (la sélection par tournoi reste dans Evolution)
+    METHODS = ("roulette", "sus", "rank", "truncation")
+    
+    def __init__(self, method=None, selection_pressure=None, truncation_ratio=None):
+        self.method = method or Config.SELECTION_METHOD
+        self.selection_pressure = selection_pressure if selection_pressure is not None else Config.SELECTION_PRESSURE
+        self.truncation_ratio = truncation_ratio if truncation_ratio is not None else Config.TRUNCATION_RATIO
+    
+    def select(self, fitness, count):
+        """Tire count indices selon l'opérateur configuré."""
+        if self.method == "sus":
+            return Selection.stochastic_universal(fitness ** self.selection_pressure, count)
+        if self.method == "rank":
+            return Selection.rank(fitness, count, self.selection_pressure)
+        if self.method == "truncation":
+            return Selection.truncation(fitness, count, self.truncation_ratio)
+        
+        # Par défaut: roulette
+        return Selection.roulette(fitness ** self.selection_pressure, count)
+    
+    @staticmethod
+    def roulette(weights, count):
+        """
+        Sélection par roulette: count tirages indépendants proportionnels aux
+        poids (sommes cumulées puis recherche dichotomique).
+        """
+        cumulative = np.cumsum(weights)
+        draws = np.random.random(count) * cumulative[-1]
+        return np.minimum(np.searchsorted(cumulative, draws, side="right"), len(weights) - 1)
+    
+    @staticmethod
+    def stochastic_universal(weights, count):
+        """
+        Échantillonnage universel stochastique: count pointeurs régulièrement
+        espacés sur la roue, avec un seul tirage aléatoire.
+        Le résultat est mélangé pour que l'ordre ne dépende pas des indices.
+        """
+        cumulative = np.cumsum(weights)
+        step = cumulative[-1] / count
+        pointers = (np.random.random() + np.arange(count)) * step
+        selected = np.minimum(np.searchsorted(cumulative, pointers, side="right"), len(weights) - 1)
+        
+        np.random.shuffle(selected)
+        return selected
+    
+    @staticmethod
+    def rank(fitness, count, pressure):
+        """
+        Sélection par rang (linéaire): la probabilité ne dépend que du
+        classement. pressure (entre 1 et 2) est le poids relatif du meilleur.
+        """
+        num = len(fitness)
+        if num == 1:
+            return np.zeros(count, dtype=np.int64)
+        
+        pressure = min(max(pressure, 1.0), 2.0)
+        
+        # Rang de chaque créature (0 = moins adaptée)
+        ranks = np.empty(num)
+        ranks[np.argsort(fitness, kind="stable")] = np.arange(num)
+        weights = (2 - pressure) / num + 2 * ranks * (pressure - 1) / (num * (num - 1))
+        
+        return Selection.roulette(weights, count)
+    
+    @staticmethod
+    def truncation(fitness, count, ratio):
+        """
+        Sélection par troncature: tirage uniforme parmi la fraction ratio
+        des créatures les plus adaptées (sélection partielle, sans tri complet).
+        """
+        num = len(fitness)
+        kept = min(num, max(1, int(num * ratio)))
+        best = np.argpartition(-fitness, kept - 1)[:kept]
+        
+        return best[np.random.randint(kept, size=count)]
@@ -48,6 +48,9 @@ class GameLoop:
             
             # Limitation de la fréquence d'images
             self.clock.tick(Config.FPS * self.simulation_speed)
+        
+        # Terminer l'écriture des données de la simulation
+        self.population.close()
     
     def update(self):
         """Mise à jour de l'état de la simulation."""
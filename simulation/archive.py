@@ -0,0 +1,145 @@
+import os
+import numpy as np
+from config import Config
+from creatures.phenotype import Phenotype
+
+class DeathArchive:
+    """
+    Archive compacte des créatures mortes.
+    Chaque mort est réduite à un enregistrement (identifiants, dates, cause,
+    énergie finale et génome) stocké dans un tampon circulaire de taille fixe.
+    Les blocs pleins sont ajoutés à des fichiers colonnes sur disque, relus
+    à la demande, pour que la mémoire reste constante sur de longues simulations.
+    La taille de chaque bloc écrit est notée dans counts.bin (le bloc écrit à
+    la fermeture peut être partiel).
+    """
+    # Causes de mort (codées par leur indice)
+    CAUSES = ("starvation", "injuries", "old_age", "culled")
+    CAUSE_CODES = {cause: code for code, cause in enumerate(CAUSES)}
+    
+    # Format d'un enregistrement (une colonne par champ)
+    DTYPE = np.dtype([
+        ("id", np.int64),
+        ("parent1", np.int64),
+        ("parent2", np.int64),
+        ("birth_tick", np.int64),
+        ("death_tick", np.int64),
+        ("cause", np.int8),
+        ("energy", np.float32),
+        ("genes", np.float32, (len(Phenotype.TRAITS),)),
+    ])
+    
+    def __init__(self, directory=None, chunk_size=None):
+        # Dossier des fichiers colonnes (None = blocs pleins non conservés)
+        self.directory = directory
+        self.chunk_size = chunk_size or Config.ARCHIVE_CHUNK_SIZE
+        
+        # Tampon en mémoire (réutilisé après chaque écriture)
+        self.buffer = np.zeros(self.chunk_size, dtype=DeathArchive.DTYPE)
+        self.buffered = 0
+        
+        # Nombre d'enregistrements de chaque bloc déjà écrit sur disque
+        # (relu si le dossier contient déjà une archive, pour la consulter)
+        self.chunk_counts = []
+        if directory and os.path.exists(self._column_path("counts")):
+            self.chunk_counts = np.fromfile(self._column_path("counts"), dtype=np.int64).tolist()
+        self.dropped = 0
+    
+    def __len__(self):
+        """Nombre d'enregistrements consultables."""
+        return sum(self.chunk_counts) + self.buffered
+    
+    def record(self, creatures, tick, causes):
+        """
+        Archive des créatures mortes à la frame tick.
+        causes est une cause commune ou une liste (une cause par créature).
+        """
+        count = len(creatures)
+        if count == 0:
+            return
+        
+        if isinstance(causes, str):
+            causes = [causes] * count
+        
+        records = np.zeros(count, dtype=DeathArchive.DTYPE)
+        records["id"] = [c.id for c in creatures]
+        records["parent1"] = [c.parents[0] for c in creatures]
+        records["parent2"] = [c.parents[1] for c in creatures]
+        records["birth_tick"] = [c.birth_tick for c in creatures]
+        records["death_tick"] = tick
+        records["cause"] = [DeathArchive.CAUSE_CODES[cause] for cause in causes]
+        records["energy"] = [c.energy for c in creatures]
+        records["genes"] = [c.genome.phenotype.genes for c in creatures]
+        
+        # Remplir le tampon, en écrivant chaque bloc plein
+        start = 0
+        while start < count:
+            take = min(count - start, self.chunk_size - self.buffered)
+            self.buffer[self.buffered:self.buffered + take] = records[start:start + take]
+            self.buffered += take
+            start += take
+            
+            if self.buffered == self.chunk_size:
+                self.flush()
+    
+    def flush(self, partial=False):
+        """
+        Ajoute le bloc du tampon aux fichiers colonnes puis vide le tampon.
+        Un bloc incomplet n'est écrit que si partial est vrai (fermeture).
+        """
+        if self.buffered == 0 or (self.buffered < self.chunk_size and not partial):
+            return
+        
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            for name in DeathArchive.DTYPE.names:
+                with open(self._column_path(name), "ab") as column_file:
+                    column_file.write(np.ascontiguousarray(self.buffer[name][:self.buffered]).tobytes())
+            with open(self._column_path("counts"), "ab") as counts_file:
+                counts_file.write(np.int64(self.buffered).tobytes())
+            self.chunk_counts.append(self.buffered)
+        else:
+            self.dropped += self.buffered
+        
+        self.buffered = 0
+    
+    def close(self):
+        """Écrit les enregistrements restants (bloc partiel) sur disque."""
+        self.flush(partial=True)
+    
+    def iter_chunks(self):
+        """
+        Parcourt l'archive bloc par bloc (tableaux structurés), du plus ancien
+        au plus récent. Les blocs sur disque sont lus un à la fois.
+        """
+        if self.directory:
+            start = 0
+            for count in self.chunk_counts:
+                yield self._read_chunk(start, count)
+                start += count
+        
+        if self.buffered:
+            yield self.buffer[:self.buffered].copy()
+    
+    def iter_records(self):
+        """Parcourt les enregistrements un par un."""
+        for chunk in self.iter_chunks():
+            for record in chunk:
+                yield record
+    
+    def _read_chunk(self, start, size):
+        """Relit un bloc (size enregistrements à partir de l'enregistrement start) depuis les fichiers colonnes."""
+        records = np.empty(size, dtype=DeathArchive.DTYPE)
+        for name in DeathArchive.DTYPE.names:
+            field = DeathArchive.DTYPE.fields[name][0]
+            base_dtype = field.base
+            per_record = int(np.prod(field.shape)) if field.shape else 1
+            offset = start * per_record * base_dtype.itemsize
+            values = np.fromfile(self._column_path(name), dtype=base_dtype, count=size * per_record, offset=offset)
+            records[name] = values.reshape((size,) + field.shape)
+        
+        return records
+    
+    def _column_path(self, name):
+        """Chemin du fichier d'une colonne."""
+        return os.path.join(self.directory, name + ".bin")
@@ -0,0 +1,138 @@
+import numpy as np
+from config import Config
+
+class History:
+    """
+    Série temporelle en colonnes NumPy, de mémoire bornée.
+    Les lignes récentes sont gardées à pleine résolution; les plus anciennes
+    sont regroupées en tranches (minimum, moyenne, maximum) dont la largeur
+    double lorsque leur nombre dépasse la limite.
+    Chaque ligne est repérée par une clé croissante (génération, jour...).
+    """
+    def __init__(self, columns, recent=None, bucket_width=None, max_buckets=None):
+        self.columns = tuple(columns)
+        self.index = {column: i for i, column in enumerate(self.columns)}
+        self.recent = recent or Config.HISTORY_RECENT
+        self.bucket_width = bucket_width or Config.HISTORY_BUCKET_WIDTH
+        self.max_buckets = max_buckets or Config.HISTORY_MAX_BUCKETS
+        
+        # Lignes récentes (capacité doublée à la demande)
+        self.keys = np.zeros(16)
+        self.values = np.zeros((16, len(self.columns)))
+        self.size = 0
+        
+        # Tranches anciennes: clés de début et de fin, effectif, min, somme et max par colonne
+        self.bucket_start = np.zeros(0)
+        self.bucket_end = np.zeros(0)
+        self.bucket_count = np.zeros(0)
+        self.bucket_min = np.zeros((0, len(self.columns)))
+        self.bucket_sum = np.zeros((0, len(self.columns)))
+        self.bucket_max = np.zeros((0, len(self.columns)))
+    
+    def __len__(self):
+        """Nombre de lignes enregistrées (regroupées ou non)."""
+        return self.size + int(self.bucket_count.sum())
+    
+    def record(self, key, values):
+        """
+        Enregistre une ligne (dictionnaire colonne -> valeur). Une ligne de
+        même clé que la dernière la remplace.
+        """
+        if self.size == 0 or self.keys[self.size - 1] != key:
+            if self.size == len(self.keys):
+                self._grow()
+            self.size += 1
+        
+        row = self.size - 1
+        self.keys[row] = key
+        self.values[row] = [values.get(column, 0) for column in self.columns]
+        
+        # Trop de lignes récentes: regrouper les plus anciennes
+        if self.size >= 2 * self.recent:
+            self._compact()
+    
+    def last_key(self):
+        """Clé de la dernière ligne (None si vide)."""
+        return self.keys[self.size - 1] if self.size else None
+    
+    def last(self, column):
+        """Dernière valeur d'une colonne (None si vide)."""
+        return self.values[self.size - 1, self.index[column]] if self.size else None
+    
+    def tail(self, column, count):
+        """Dernières valeurs (pleine résolution) d'une colonne."""
+        return self.values[max(0, self.size - count):self.size, self.index[column]]
+    
+    def range(self, column, start=None, end=None):
+        """
+        Valeurs d'une colonne pour les clés de start à end (incluses).
+        Retourne (clés, minimums, moyennes, maximums); les tranches anciennes
+        apparaissent avec leur clé de début, les lignes récentes avec min = moyenne = max.
+        """
+        col = self.index[column]
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        
+        # Tranches qui recouvrent l'intervalle
+        buckets = (self.bucket_end >= start) & (self.bucket_start <= end)
+        counts = self.bucket_count[buckets]
+        
+        # Lignes récentes de l'intervalle (clés triées)
+        keys = self.keys[:self.size]
+        first = np.searchsorted(keys, start, side="left")
+        last = np.searchsorted(keys, end, side="right")
+        values = self.values[first:last, col]
+        
+        return (
+            np.concatenate((self.bucket_start[buckets], keys[first:last])),
+            np.concatenate((self.bucket_min[buckets, col], values)),
+            np.concatenate((self.bucket_sum[buckets, col] / counts, values)),
+            np.concatenate((self.bucket_max[buckets, col], values)),
+        )
+    
+    def _grow(self):
+        """Double la capacité des colonnes récentes."""
+        capacity = len(self.keys) * 2
+        keys = np.zeros(capacity)
+        values = np.zeros((capacity, len(self.columns)))
+        keys[:self.size] = self.keys[:self.size]
+        values[:self.size] = self.values[:self.size]
+        self.keys = keys
+        self.values = values
+    
+    def _compact(self):
+        """Regroupe les plus anciennes lignes récentes en tranches."""
+        count = self.size - self.recent
+        starts = np.arange(0, count, self.bucket_width)
+        ends = np.minimum(starts + self.bucket_width, count) - 1
+        keys = self.keys[:count]
+        values = self.values[:count]
+        
+        self.bucket_start = np.concatenate((self.bucket_start, keys[starts]))
+        self.bucket_end = np.concatenate((self.bucket_end, keys[ends]))
+        self.bucket_count = np.concatenate((self.bucket_count, ends - starts + 1))
+        self.bucket_min = np.concatenate((self.bucket_min, np.minimum.reduceat(values, starts, axis=0)))
+        self.bucket_sum = np.concatenate((self.bucket_sum, np.add.reduceat(values, starts, axis=0)))
+        self.bucket_max = np.concatenate((self.bucket_max, np.maximum.reduceat(values, starts, axis=0)))
+        
+        # Décaler les lignes restantes au début des colonnes
+        self.keys[:self.recent] = self.keys[count:self.size]
+        self.values[:self.recent] = self.values[count:self.size]
+        self.size = self.recent
+        
+        # Trop de tranches: les fusionner deux à deux
+        if len(self.bucket_start) > self.max_buckets:
+            self._merge_buckets()
+    
+    def _merge_buckets(self):
+        """Fusionne les tranches deux à deux (largeur doublée)."""
+        starts = np.arange(0, len(self.bucket_start), 2)
+        ends = np.minimum(starts + 1, len(self.bucket_start) - 1)
+        
+        self.bucket_start = self.bucket_start[starts]
+        self.bucket_end = self.bucket_end[ends]
+        self.bucket_count = np.add.reduceat(self.bucket_count, starts)
+        self.bucket_min = np.minimum.reduceat(self.bucket_min, starts, axis=0)
+        self.bucket_sum = np.add.reduceat(self.bucket_sum, starts, axis=0)
+        self.bucket_max = np.maximum.reduceat(self.bucket_max, starts, axis=0)
+        self.bucket_width *= 2
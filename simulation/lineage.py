@@ -0,0 +1,171 @@
+import numpy as np
+from config import Config
+
+class Lineage:
+    """
+    Généalogie compacte de toutes les créatures nées pendant la simulation.
+    Chaque naissance ajoute une ligne (identifiant, parents, génération de
+    naissance, vivante ou non) à des colonnes NumPy extensibles. Les
+    identifiants étant attribués dans l'ordre des naissances, la colonne des
+    identifiants reste triée et les recherches se font par dichotomie.
+    Les branches éteintes peuvent être élaguées pour borner la mémoire.
+    """
+    def __init__(self):
+        self.size = 0
+        self.ids = np.zeros(1024, dtype=np.int64)
+        self.parent1 = np.zeros(1024, dtype=np.int64)
+        self.parent2 = np.zeros(1024, dtype=np.int64)
+        self.birth_generation = np.zeros(1024, dtype=np.int32)
+        self.alive = np.zeros(1024, dtype=bool)
+        
+        # Taille à partir de laquelle les branches éteintes sont élaguées
+        self.prune_threshold = Config.LINEAGE_PRUNE_THRESHOLD
+    
+    def __len__(self):
+        return self.size
+    
+    def record(self, creatures, generation):
+        """Enregistre des naissances (0 = parent inconnu, pour les fondateurs)."""
+        count = len(creatures)
+        if count == 0:
+            return
+        
+        while self.size + count > len(self.ids):
+            self._grow()
+        
+        rows = slice(self.size, self.size + count)
+        self.ids[rows] = [c.id for c in creatures]
+        self.parent1[rows] = [c.parents[0] for c in creatures]
+        self.parent2[rows] = [c.parents[1] for c in creatures]
+        self.birth_generation[rows] = generation
+        self.alive[rows] = True
+        self.size += count
+    
+    def record_deaths(self, creatures):
+        """Marque des créatures comme mortes."""
+        rows = self.rows([c.id for c in creatures])
+        self.alive[rows[rows >= 0]] = False
+    
+    def rows(self, ids):
+        """Lignes des identifiants donnés (-1 si absents ou élagués)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        known = self.ids[:self.size]
+        rows = np.searchsorted(known, ids)
+        found = rows < self.size
+        found[found] = known[rows[found]] == ids[found]
+        return np.where(found, rows, -1)
+    
+    def parents(self, creature_id):
+        """Parents d'une créature (0 si inconnu)."""
+        row = int(self.rows([creature_id])[0])
+        if row < 0:
+            return 0, 0
+        return int(self.parent1[row]), int(self.parent2[row])
+    
+    def ancestors(self, ids, max_depth=None):
+        """
+        Identifiants de tous les ancêtres connus des créatures ids (sans
+        elles-mêmes), parcourus génération par génération en une passe
+        vectorisée par niveau.
+        """
+        # Lignes déjà atteintes (chaque ancêtre n'est parcouru qu'une fois)
+        visited = np.zeros(self.size, dtype=bool)
+        frontier = self.rows(np.unique(np.asarray(ids, dtype=np.int64)))
+        frontier = frontier[frontier >= 0]
+        depth = 0
+        
+        while len(frontier) and (max_depth is None or depth < max_depth):
+            parents = self.rows(np.concatenate((self.parent1[frontier], self.parent2[frontier])))
+            parents = np.unique(parents[parents >= 0])
+            frontier = parents[~visited[parents]]
+            visited[frontier] = True
+            depth += 1
+        
+        return self.ids[:self.size][visited]
+    
+    def common_ancestor(self, id_a, id_b):
+        """
+        Ancêtre commun le plus récent de deux créatures (une créature compte
+        parmi ses propres ancêtres); None s'il n'y en a pas.
+        """
+        rows = self.rows([id_a, id_b])
+        if (rows < 0).any():
+            return None
+        
+        # Ancêtres marqués et derniers ancêtres atteints, de chaque côté
+        marks = [np.zeros(self.size, dtype=bool), np.zeros(self.size, dtype=bool)]
+        frontiers = [rows[:1], rows[1:]]
+        marks[0][rows[0]] = True
+        marks[1][rows[1]] = True
+        best = -1
+        
+        while True:
+            # Lignes atteintes des deux côtés: la plus récente est le meilleur candidat
+            for side in (0, 1):
+                hits = frontiers[side][marks[1 - side][frontiers[side]]]
+                if len(hits):
+                    best = max(best, int(hits.max()))
+            
+            # Un ancêtre est toujours antérieur (ligne plus petite): inutile d'explorer sous le candidat
+            frontiers = [frontier[frontier > best] for frontier in frontiers]
+            if not any(len(frontier) for frontier in frontiers):
+                break
+            
+            for side in (0, 1):
+                frontier = frontiers[side]
+                parents = self.rows(np.concatenate((self.parent1[frontier], self.parent2[frontier])))
+                parents = np.unique(parents[parents >= 0])
+                parents = parents[~marks[side][parents]]
+                marks[side][parents] = True
+                frontiers[side] = parents
+        
+        return int(self.ids[best]) if best >= 0 else None
+    
+    def prune(self):
+        """
+        Supprime les branches éteintes: ne garde que les créatures vivantes
+        et leurs ancêtres. Retourne le nombre de lignes supprimées.
+        """
+        alive_ids = self.ids[:self.size][self.alive[:self.size]]
+        keep = np.zeros(self.size, dtype=bool)
+        keep[self.alive[:self.size]] = True
+        ancestor_rows = self.rows(self.ancestors(alive_ids))
+        keep[ancestor_rows[ancestor_rows >= 0]] = True
+        
+        kept = int(keep.sum())
+        for column in (self.ids, self.parent1, self.parent2, self.birth_generation, self.alive):
+            column[:kept] = column[:self.size][keep]
+        
+        removed = self.size - kept
+        self.size = kept
+        return removed
+    
+    def prune_if_needed(self):
+        """Élague les branches éteintes quand la généalogie dépasse le seuil."""
+        if self.size < self.prune_threshold:
+            return 0
+        
+        removed = self.prune()
+        
+        # Ne pas élaguer à nouveau avant que la généalogie ait de nouveau doublé
+        self.prune_threshold = max(Config.LINEAGE_PRUNE_THRESHOLD, self.size * 2)
+        return removed
+    
+    def export(self, path):
+        """Exporte l'arbre (colonnes) dans un fichier .npz pour une analyse hors ligne."""
+        np.savez_compressed(
+            path,
+            ids=self.ids[:self.size],
+            parent1=self.parent1[:self.size],
+            parent2=self.parent2[:self.size],
+            birth_generation=self.birth_generation[:self.size],
+            alive=self.alive[:self.size]
+        )
+    
+    def _grow(self):
+        """Double la capacité des colonnes."""
+        for name in ("ids", "parent1", "parent2", "birth_generation", "alive"):
+            column = getattr(self, name)
+            grown = np.zeros(len(column) * 2, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
@@ -1,31 +1,79 @@
+import os
+import tempfile
+import time
 import numpy as np
 from creatures.evolution import Evolution
 from config import Config
 from simulation.statistics import Statistics
 from creatures.creature import Creature
+from creatures.phenotype import Phenotype
+from creatures.pool import CreaturePool
+from simulation.archive import DeathArchive
+from simulation.lineage import Lineage
+from simulation.registry import CreatureRegistry
+from simulation.spatial_index import SpatialIndex
+from simulation.speciation import Speciation
+from simulation.stats_log import StatsLog
+from creatures.behavior import Behavior
+from world.cell import Cell
 
 class Population:
     """
     Gère l'ensemble des créatures dans la simulation.
     S'occupe de la reproduction, de la sélection naturelle et de l'évolution.
     """
+    # Distance en dessous de laquelle deux créatures interagissent
+    INTERACTION_DISTANCE = 1.5
+    
     def __init__(self, grid):
         self.grid = grid
-        self.creatures = []
-        self.dead_creatures = []  # Historique des créatures mortes
+        self.registry = CreatureRegistry()  # Créatures vivantes
+        self.death_count = 0      # Nombre total de créatures mortes
         self.generation = 1       # Compteur de génération
+        self.tick = 0             # Compteur de frames
+        
+        # Dossier des données de cette simulation (archives, journaux), unique
+        # même pour deux simulations lancées dans la même seconde
+        self.run_directory = None
+        if Config.RUN_DIRECTORY:
+            os.makedirs(Config.RUN_DIRECTORY, exist_ok=True)
+            self.run_directory = tempfile.mkdtemp(
+                prefix=time.strftime("%Y%m%d_%H%M%S_"), dir=Config.RUN_DIRECTORY
+            )
         
-        # Importation du système d'évolution
-        from creatures.evolution import Evolution
+        # Archive compacte des créatures mortes (bornée en mémoire)
+        self.archive = DeathArchive(
+            os.path.join(self.run_directory, "deaths") if self.run_directory else None
+        )
         
-        # Initialisation du système d'évolution
-        self.evolution = Evolution(grid)
+        # Généalogie de toutes les créatures (parents et génération de naissance)
+        self.lineage = Lineage()
+        
+        # Journal des statistiques sur disque (écrit en arrière-plan)
+        self.stats_log = None
+        if self.run_directory:
+            self.stats_log = StatsLog(os.path.join(self.run_directory, "stats"))
+        
+        # Réserve de créatures mortes recyclées pour les naissances
+        self.pool = CreaturePool()
+        
+        # Index de cellule de chaque créature, recalculé au plus une fois par frame
+        self.cell_index = None
+        
+        # Espèces (regroupement partagé, calculé une fois par génération)
+        self.speciation = Speciation()
         
         # Importation des statistiques
         from simulation.statistics import Statistics
         
-        # Statistiques de population
-        self.statistics = Statistics()
+        # Statistiques de population (partagées avec l'évolution pour les événements)
+        self.statistics = Statistics(self.stats_log)
+        
+        # Importation du système d'évolution
+        from creatures.evolution import Evolution
+        
+        # Initialisation du système d'évolution
+        self.evolution = Evolution(grid, self.statistics)
         
         # Initialisation de la population de départ
         self.initialize_population()
@@ -35,6 +83,7 @@ class Population:
         # Cette méthode sera implémentée avec vos classes existantes
         from creatures.creature import Creature
         
+        initial_creatures = []
         for _ in range(Config.INITIAL_POPULATION):
             # Position aléatoire
             x = np.random.randint(0, self.grid.width)
@@ -47,92 +96,272 @@ class Population:
             
             # Créer la créature et l'ajouter à la population
             creature = Creature(self.grid, x, y)
-            self.creatures.append(creature)
+            initial_creatures.append(creature)
+        
+        self.add_creatures(initial_creatures)
         
         # Enregistrement des statistiques initiales
-        self.statistics.update_population_stats(self.generation, self)
+        self.statistics.update_population_stats(self.generation, self, snapshot=True)
             
     def update(self):
         """Met à jour toutes les créatures et gère les interactions."""
-        # Liste des créatures à supprimer
-        to_remove = []
+        self.tick += 1
+        deaths_before = self.death_count
+        
+        # Les positions vont changer: l'index de cellules de la frame précédente est périmé
+        self.invalidate_cell_index()
+        
+        # Indices des créatures qui demandent à manger pendant cette frame
+        eater_rows = []
+        
+        # Mise à jour de chaque créature (vieillissement, comportement)
+        for row, creature in enumerate(self.creatures):
+            creature.act()
+            if creature.meals:
+                eater_rows.append(row)
         
-        # Tentatives de reproduction à traiter après les mises à jour
-        reproduction_pairs = []
+        # Partager la nourriture entre les créatures qui mangent, avant la vérification de la mort
+        self.resolve_feeding(eater_rows)
         
-        # Mise à jour de chaque créature
+        # Créatures à supprimer et créatures vivantes après leur repas
+        to_remove = []
+        alive = []
         for creature in self.creatures:
-            # Mettre à jour la créature et vérifier si elle survit
-            if not creature.update():
+            if creature.is_dead():
                 to_remove.append(creature)
-                continue
-            
-            # Gestion des interactions entre créatures
-            for other in self.creatures:
-                if creature == other:
-                    continue
-                
-                # Calculer la distance entre les créatures
-                distance = np.sqrt((creature.x - other.x)**2 + (creature.y - other.y)**2)
-                
-                # Si les créatures sont proches
-                if distance < 1.5:
-                    # Possibilité de reproduction
-                    if (creature.state == "mating" or other.state == "mating") and \
-                       creature.is_ready_to_reproduce() and other.is_ready_to_reproduce():
-                        reproduction_pairs.append((creature, other))
-                    
-                    # Possibilité de combat (basé sur l'agressivité)
-                    elif creature.genome.traits["aggression"] > 70 and np.random.random() < 0.2:
-                        self.handle_combat(creature, other)
-        
-        # Traiter les reproductions
-        new_creatures = []
-        for creature1, creature2 in reproduction_pairs:
-            # Vérifier si les créatures sont toujours vivantes et prêtes
-            if creature1 not in to_remove and creature2 not in to_remove:
-                # Créer un nouvel enfant
-                child = creature1.reproduce(creature2)
-                new_creatures.append(child)
+            else:
+                alive.append(creature)
+        
+        # Paires de créatures proches (index spatial)
+        first, second = self.find_interactions(alive)
+        
+        # Appariement des partenaires: chaque créature se reproduit au plus une fois par frame
+        reproduction_pairs, mating_candidates = self.pair_mates(alive, first, second)
+        
+        # Possibilité de combat entre les autres créatures proches (basé sur l'agressivité)
+        self.resolve_combat(alive, first[~mating_candidates], second[~mating_candidates])
+        
+        # Traiter les reproductions par lot
+        new_creatures = self.breed(reproduction_pairs)
         
         # Ajouter les nouveaux-nés
-        self.creatures.extend(new_creatures)
+        self.add_creatures(new_creatures)
         
-        # Supprimer les créatures mortes
-        for creature in to_remove:
-            self.creatures.remove(creature)
-            self.dead_creatures.append(creature)
+        # Supprimer les créatures mortes, les archiver et les rendre à la réserve
+        self.registry.remove(to_remove)
+        self.record_deaths(to_remove, [c.cause_of_death() for c in to_remove])
         
         # Contrôle de la population (limite maximale pour éviter les surcharges)
         self.control_population()
         
+        # La composition de la population a pu changer
+        self.invalidate_cell_index()
+        
         # Mise à jour des statistiques
         if len(to_remove) > 0 or len(new_creatures) > 0:
             self.statistics.update_population_stats(self.generation, self)
+        self.statistics.record_tick(
+            self.tick, self.generation, len(self.creatures), len(new_creatures), self.death_count - deaths_before
+        )
     
-    def handle_combat(self, attacker, defender):
-        """Gère un combat entre deux créatures."""
-        # Calculer la force d'attaque
-        attack_power = attacker.genome.traits["strength"] * \
-                      (1 + attacker.genome.traits["aggression"] / 100)
-        
-        # Calculer la défense
-        defense = defender.genome.traits["strength"] * \
-                 (1 - defender.genome.traits["aggression"] / 200)  # L'agressivité réduit la défense
-        
-        # Résultat du combat
-        damage = max(0, attack_power - defense) / 10  # Réduire l'échelle des dégâts
+    @property
+    def creatures(self):
+        """Liste des créatures vivantes (l'ordre peut changer entre deux frames)."""
+        return self.registry.creatures
+    
+    def add_creatures(self, new_creatures):
+        """Ajoute des nouveau-nés à la population en notant leur frame de naissance."""
+        for creature in new_creatures:
+            creature.birth_tick = self.tick
+        
+        self.registry.add(new_creatures)
+        self.lineage.record(new_creatures, self.generation)
+        self.statistics.record_births(new_creatures)
+        self.invalidate_cell_index()
+    
+    def record_deaths(self, dead_creatures, causes):
+        """
+        Archive des créatures retirées de la population puis les rend à la réserve.
+        causes est une cause commune ou une liste (une cause par créature).
+        """
+        self.death_count += len(dead_creatures)
+        self.archive.record(dead_creatures, self.tick, causes)
+        self.lineage.record_deaths(dead_creatures)
+        self.statistics.record_deaths(dead_creatures)
+        self.pool.release_all(dead_creatures)
+    
+    def find_interactions(self, creatures):
+        """
+        Retourne les paires (first, second) d'indices de créatures à moins de
+        INTERACTION_DISTANCE l'une de l'autre, chaque paire une seule fois.
+        """
+        count = len(creatures)
+        x = np.fromiter((c.x for c in creatures), dtype=float, count=count)
+        y = np.fromiter((c.y for c in creatures), dtype=float, count=count)
         
-        # Appliquer les dégâts
-        defender.health -= damage
+        index = SpatialIndex(x, y, Population.INTERACTION_DISTANCE)
+        return index.pairs(Population.INTERACTION_DISTANCE)
+    
+    def pair_mates(self, creatures, first, second):
+        """
+        Forme les couples de la frame parmi les paires proches.
+        Une paire est candidate si l'une des deux créatures cherche un partenaire
+        et que les deux sont prêtes; les candidates sont retenues par ordre de
+        compatibilité génétique décroissante (couplage glouton maximal), chaque
+        créature n'apparaissant que dans un seul couple.
+        Retourne les couples et le masque des paires candidates.
+        """
+        mating = np.array([c.state == "mating" for c in creatures], dtype=bool)
+        ready = np.array([c.is_ready_to_reproduce() for c in creatures], dtype=bool)
+        
+        candidates = (mating[first] | mating[second]) & ready[first] & ready[second]
+        if not np.any(candidates):
+            return [], candidates
+        
+        pair_first = first[candidates]
+        pair_second = second[candidates]
+        
+        # Compatibilité génétique de toutes les paires candidates en une passe
+        scores = Behavior.compatibility_scores(
+            np.array([creatures[i].genome.phenotype.genes for i in pair_first.tolist()]),
+            np.array([creatures[j].genome.phenotype.genes for j in pair_second.tolist()])
+        )
+        
+        # Meilleures paires d'abord (identifiants pour départager les égalités)
+        ids = np.array([c.id for c in creatures])
+        order = np.lexsort((ids[pair_second], ids[pair_first], -scores))
+        
+        # Couplage glouton en une passe
+        matched = set()
+        pairs = []
+        for k in order.tolist():
+            i, j = int(pair_first[k]), int(pair_second[k])
+            if i in matched or j in matched:
+                continue
+            matched.add(i)
+            matched.add(j)
+            pairs.append((creatures[i], creatures[j]))
         
-        # Consommation d'énergie pour l'attaquant
-        attacker.energy -= attack_power / 20
+        return pairs, candidates
+    
+    def breed(self, pairs):
+        """Fait naître un enfant par couple et retourne les nouveau-nés."""
+        return [parent1.reproduce(parent2, self.pool) for parent1, parent2 in pairs]
+    
+    def resolve_feeding(self, rows):
+        """
+        Résout les repas de la frame pour les créatures d'indices rows.
+        Chaque créature demande Config.MEAL_SIZE par repas demandé pendant la
+        frame. Les demandes sont regroupées par cellule; une cellule disputée
+        est partagée proportionnellement aux demandes, ou servie dans l'ordre
+        des identifiants (Config.FOOD_ALLOCATION), indépendamment de l'ordre
+        de la liste.
+        """
+        if not rows:
+            return
+        
+        rows = np.asarray(rows)
+        eaters = [self.creatures[i] for i in rows]
+        cells = self.get_cell_index()[rows]
+        demand = np.array([c.meals for c in eaters], dtype=float) * Config.MEAL_SIZE
+        
+        # Vue à plat de la nourriture de la grille
+        food = self.grid.food.ravel()
+        available = food[cells]
+        
+        if Config.FOOD_ALLOCATION == "first_come":
+            # Tri stable par cellule puis par identifiant
+            ids = np.array([c.id for c in eaters])
+            order = np.lexsort((ids, cells))
+            sorted_cells = cells[order]
+            sorted_demand = demand[order]
+            
+            # Demande cumulée des créatures servies avant, au sein de chaque cellule
+            cumulative = np.cumsum(sorted_demand) - sorted_demand
+            group_start = np.r_[True, sorted_cells[1:] != sorted_cells[:-1]]
+            group_offset = np.maximum.accumulate(np.where(group_start, cumulative, 0))
+            served_before = cumulative - group_offset
+            
+            eaten = np.empty(len(rows))
+            eaten[order] = np.clip(available[order] - served_before, 0, sorted_demand)
+        else:
+            # Partage proportionnel à la demande totale de chaque cellule
+            total_demand = np.bincount(cells, weights=demand, minlength=food.size)[cells]
+            eaten = demand * np.minimum(1.0, available / total_demand)
+        
+        # Retirer la nourriture consommée (addition groupée par cellule)
+        food -= np.bincount(cells, weights=eaten, minlength=food.size)
+        food[cells] = np.maximum(food[cells], 0)
+        self.grid.aggregates.add("food", -eaten.sum())
+        
+        # Gain d'énergie (limité à 100)
+        energies = np.array([c.energy for c in eaters], dtype=float)
+        energies = np.minimum(energies + eaten * Config.FOOD_ENERGY, 100)
+        
+        for creature, energy, amount in zip(eaters, energies.tolist(), eaten.tolist()):
+            creature.energy = energy
+            if amount > 0:
+                # Repas pris: réinitialiser la cible
+                creature.target = None
+                creature.state = "exploring"
+    
+    def resolve_combat(self, creatures, first, second):
+        """
+        Résout en une passe tous les combats possibles de la frame.
+        Chaque paire proche (first, second) donne deux attaques potentielles
+        (dans les deux sens); les dégâts sont cumulés par défenseur.
+        """
+        if len(first) == 0:
+            return
+        
+        # Attaques potentielles dans les deux sens
+        attackers = np.concatenate((first, second))
+        defenders = np.concatenate((second, first))
+        
+        # Traits des créatures concernées
+        rows = np.unique(attackers)
+        strength = np.zeros(len(creatures))
+        aggression = np.zeros(len(creatures))
+        strength[rows] = [creatures[row].genome.phenotype.genes[Phenotype.INDEX["strength"]] for row in rows.tolist()]
+        aggression[rows] = [creatures[row].genome.phenotype.genes[Phenotype.INDEX["aggression"]] for row in rows.tolist()]
+        
+        # Déclenchement basé sur l'agressivité (un seul tirage pour toutes les attaques)
+        triggered = (aggression[attackers] > 70) & (np.random.random(len(attackers)) < 0.2)
+        if not triggered.any():
+            return
+        attackers = attackers[triggered]
+        defenders = defenders[triggered]
         
-        # Si le défenseur survit, il peut fuir
-        if defender.health > 0 and np.random.random() < 0.7:
-            defender.state = "fleeing"
-            defender.target = (attacker.x, attacker.y)  # Fuir l'attaquant
+        # Calculer la force d'attaque
+        attack_power = strength[attackers] * (1 + aggression[attackers] / 100)
+        
+        # Calculer la défense (l'agressivité réduit la défense)
+        defense = strength[defenders] * (1 - aggression[defenders] / 200)
+        
+        # Résultat des combats (échelle des dégâts réduite)
+        damage = np.maximum(0, attack_power - defense) / 10
+        
+        # Cumuler les dégâts par défenseur et l'énergie dépensée par attaquant
+        count = len(creatures)
+        damage_taken = np.bincount(defenders, weights=damage, minlength=count)
+        energy_spent = np.bincount(attackers, weights=attack_power / 20, minlength=count)
+        
+        health = np.zeros(count)
+        for row in np.unique(np.concatenate((attackers, defenders))).tolist():
+            creature = creatures[row]
+            creature.health -= float(damage_taken[row])
+            creature.energy -= float(energy_spent[row])
+            health[row] = creature.health
+        
+        # Les défenseurs survivants peuvent fuir leur (dernier) attaquant
+        flee = (health[defenders] > 0) & (np.random.random(len(defenders)) < 0.7)
+        last_attack = np.full(count, -1)
+        np.maximum.at(last_attack, defenders[flee], np.flatnonzero(flee))
+        
+        for row in np.flatnonzero(last_attack >= 0).tolist():
+            attacker = creatures[attackers[last_attack[row]]]
+            creatures[row].state = "fleeing"
+            creatures[row].target = (attacker.x, attacker.y)  # Fuir l'attaquant
     
     def end_day(self):
         """
@@ -159,6 +388,9 @@ class Population:
         # Analyser l'adaptation de la population
         adaptation_info = self.evolution.analyze_adaptation(self)
         
+        # Regroupement en espèces du jour (budget de temps borné), partagé ensuite
+        self.speciation.update(self)
+        
         # Détection d'émergence d'espèces
         num_species, species_counts = self.evolution.detect_speciation(self)
         if num_species > 1:
@@ -167,12 +399,41 @@ class Population:
                 "speciation",
                 f"{num_species} espèces distinctes détectées dans la population."
             )
+        self.log_species_changes()
         
-        # Enregistrement des statistiques quotidiennes
-        self.statistics.update_population_stats(self.generation, self)
+        # Enregistrement des statistiques quotidiennes (instantané complet et espèces)
+        self.statistics.update_population_stats(self.generation, self, snapshot=True)
         
         # Mise à jour des métriques environnementales
         self.statistics.update_environment_metrics(self.generation, self.grid)
+        
+        # Borner la mémoire de la généalogie
+        self.lineage.prune_if_needed()
+    
+    def log_species_changes(self):
+        """Enregistre les naissances, divisions et extinctions d'espèces du jour."""
+        changes = self.speciation.changes
+        
+        for species_id in changes["births"]:
+            self.evolution.log_evolutionary_event(
+                self.generation,
+                "species_birth",
+                f"Apparition de l'espèce {species_id}."
+            )
+        
+        for parent_id, species_id in changes["splits"]:
+            self.evolution.log_evolutionary_event(
+                self.generation,
+                "species_split",
+                f"L'espèce {parent_id} s'est divisée: nouvelle espèce {species_id}."
+            )
+        
+        for species_id in changes["extinctions"]:
+            self.evolution.log_evolutionary_event(
+                self.generation,
+                "species_extinction",
+                f"Extinction de l'espèce {species_id}."
+            )
     
     def trigger_breeding_season(self):
         """Déclenche une saison de reproduction pour maintenir la population."""
@@ -191,11 +452,11 @@ class Population:
             # Créer plusieurs enfants par couple
             num_children = np.random.randint(1, 4)
             for _ in range(num_children):
-                child = parent1.reproduce(parent2)
+                child = parent1.reproduce(parent2, self.pool)
                 new_creatures.append(child)
         
         # Ajouter les nouveaux-nés à la population
-        self.creatures.extend(new_creatures)
+        self.add_creatures(new_creatures)
         
         # Enregistrer l'événement
         if new_creatures:
@@ -207,19 +468,20 @@ class Population:
     
     def control_population(self):
         """Limite la taille de la population pour éviter les surcharges."""
-        max_population = Config.INITIAL_POPULATION * 3
+        excess = len(self.creatures) - Config.MAX_POPULATION
         
-        if len(self.creatures) > max_population:
-            # Trier les créatures par âge et santé (éliminer les plus âgées/faibles)
-            self.creatures.sort(key=lambda c: c.age / c.max_age - c.health / 100)
+        if excess > 0:
+            # Sélection partielle: seules les excess créatures les moins bien classées sont isolées
+            scores = self.culling_scores()
+            worst = np.argpartition(-scores, excess - 1)[:excess]
+            removed = [self.creatures[row] for row in worst.tolist()]
             
             # Conserver uniquement les plus fortes
-            excess = len(self.creatures) - max_population
-            removed = self.creatures[:excess]
-            self.creatures = self.creatures[excess:]
+            self.registry.remove(removed)
+            self.invalidate_cell_index()
             
-            # Ajouter aux statistiques
-            self.dead_creatures.extend(removed)
+            # Archiver les créatures éliminées et les rendre à la réserve
+            self.record_deaths(removed, "culled")
             
             # Enregistrer l'événement
             self.evolution.log_evolutionary_event(
@@ -228,52 +490,89 @@ class Population:
                 f"Contrôle de population: {excess} créatures éliminées par sélection naturelle."
             )
     
+    def culling_scores(self):
+        """
+        Score d'élimination de chaque créature selon Config.CULLING_POLICY
+        (les scores les plus élevés sont éliminés en premier).
+        """
+        count = len(self.creatures)
+        
+        if Config.CULLING_POLICY == "random":
+            return np.random.random(count)
+        
+        if Config.CULLING_POLICY == "fitness":
+            # Survie proportionnelle au fitness (tirage pondéré sans remise par clés exponentielles)
+            fitness = self.evolution.calculate_fitness(self)
+            return np.random.exponential(size=count) / fitness
+        
+        # Par défaut: éliminer les plus âgées et les plus faibles
+        age_ratio = np.fromiter((c.age / c.max_age for c in self.creatures), dtype=float, count=count)
+        health = np.fromiter((c.health for c in self.creatures), dtype=float, count=count)
+        return age_ratio - health / 100
+    
+    def close(self):
+        """
+        Fin de simulation: écrit les dernières morts archivées, termine le
+        journal des statistiques et exporte la généalogie.
+        """
+        self.archive.close()
+        if self.stats_log:
+            self.stats_log.close()
+        if self.run_directory:
+            os.makedirs(self.run_directory, exist_ok=True)
+            self.lineage.export(os.path.join(self.run_directory, "lineage.npz"))
+    
     def get_statistics(self):
         """Récupère les statistiques principales pour l'affichage."""
         return self.statistics.get_summary()
     
+    def invalidate_cell_index(self):
+        """Invalide l'index de cellules (déplacements, naissances ou morts)."""
+        self.cell_index = None
+    
+    def get_cell_index(self):
+        """
+        Récupère l'index plat (x * hauteur + y) de la cellule de chaque créature,
+        aligné sur self.creatures. Calculé une seule fois par frame et partagé
+        par tous les sous-systèmes.
+        """
+        if self.cell_index is None:
+            count = len(self.creatures)
+            cell_x = np.fromiter((c.x for c in self.creatures), dtype=float, count=count).astype(int)
+            cell_y = np.fromiter((c.y for c in self.creatures), dtype=float, count=count).astype(int)
+            
+            # Les positions restent dans la grille; le bornage n'est qu'une sécurité
+            np.clip(cell_x, 0, self.grid.width - 1, out=cell_x)
+            np.clip(cell_y, 0, self.grid.height - 1, out=cell_y)
+            
+            self.cell_index = cell_x * self.grid.height + cell_y
+        
+        return self.cell_index
+    
+    def gather(self, field, rows=None):
+        """
+        Récupère la valeur d'un champ de cellule ("terrain", "temperature",
+        "humidity", "food", "water") à la position de chaque créature,
+        ou seulement des créatures d'indices rows.
+        """
+        cell_index = self.get_cell_index()
+        if rows is not None:
+            cell_index = cell_index[rows]
+        
+        return getattr(self.grid, field).ravel()[cell_index]
+    
     def get_creatures_by_terrain(self):
         """Compte les créatures par type de terrain."""
-        terrain_counts = {terrain: 0 for terrain in Config.ENVIRONMENTS.keys()}
-        
-        for creature in self.creatures:
-            cell_x, cell_y = int(creature.x), int(creature.y)
-            cell = self.grid.get_cell(cell_x, cell_y)
-            
-            if cell:
-                terrain_counts[cell.terrain_type] += 1
+        counts = np.bincount(self.gather("terrain"), minlength=len(Cell.TERRAIN_TYPES))
         
-        return terrain_counts
+        return dict(zip(Cell.TERRAIN_TYPES, counts.tolist()))
     
     def get_species_diversity(self):
-        """Calcule un indice de diversité des espèces basé sur les traits génétiques."""
+        """
+        Calcule un indice de diversité des espèces basé sur les traits génétiques
+        (lu dans les histogrammes des traits, en temps constant).
+        """
         if len(self.creatures) < 5:
             return 0
         
-        # Extraire les valeurs de traits clés
-        trait_values = {}
-        for creature in self.creatures:
-            for trait, value in creature.genome.traits.items():
-                if trait not in trait_values:
-                    trait_values[trait] = []
-                trait_values[trait].append(value)
-        
-        # Calculer l'écart-type de chaque trait
-        diversity_scores = {}
-        for trait, values in trait_values.items():
-            if isinstance(values[0], bool):
-                # Pour les traits booléens, calculer la proportion
-                true_ratio = sum(1 for v in values if v) / len(values)
-                # Diversité maximale quand le ratio est proche de 0.5
-                diversity_scores[trait] = 1 - abs(0.5 - true_ratio) * 2
-            else:
-                # Pour les traits numériques, calculer l'écart-type normalisé
-                std_dev = np.std(values)
-                max_possible_std = 100 / np.sqrt(12)  # Écart-type max pour une distribution uniforme [0, 100]
-                diversity_scores[trait] = min(1.0, std_dev / max_possible_std)
-        
-        # Moyenner les scores de diversité (en ignorant les couleurs)
-        relevant_traits = [t for t in diversity_scores.keys() if not t.startswith("color_")]
-        avg_diversity = sum(diversity_scores[t] for t in relevant_traits) / len(relevant_traits)
-        
-        return avg_diversity
\ No newline at end of file
+        return self.statistics.histograms.diversity()
\ No newline at end of file
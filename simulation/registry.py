@@ -0,0 +1,73 @@
+import numpy as np
+from creatures.phenotype import Phenotype
+
+class CreatureRegistry:
+    """
+    Conteneur des créatures vivantes.
+    Les créatures sont rangées dans une liste dense; chacune connaît sa ligne
+    (creature.row) et est retrouvable par son identifiant stable. Les ajouts se
+    font par lots et les suppressions par échange avec la dernière ligne,
+    en temps constant par créature. La matrice des vecteurs de traits suit
+    les mêmes lignes (le génome d'une créature vivante ne change pas).
+    """
+    def __init__(self):
+        self.creatures = []   # Liste dense (l'ordre peut changer lors des suppressions)
+        self.by_id = {}       # Identifiant -> créature
+        
+        # Vecteurs de traits (Phenotype.genes), une ligne par créature (capacité doublée à la demande)
+        self.genes = np.zeros((64, len(Phenotype.TRAITS)))
+    
+    def __len__(self):
+        return len(self.creatures)
+    
+    def __iter__(self):
+        return iter(self.creatures)
+    
+    def __contains__(self, creature):
+        return self.by_id.get(creature.id) is creature
+    
+    def get(self, creature_id):
+        """Récupère une créature vivante par son identifiant (None si absente)."""
+        return self.by_id.get(creature_id)
+    
+    def add(self, creatures):
+        """Ajoute un lot de créatures en fin de liste."""
+        row = len(self.creatures)
+        if not creatures:
+            return
+        
+        while row + len(creatures) > len(self.genes):
+            grown = np.zeros((len(self.genes) * 2, self.genes.shape[1]))
+            grown[:row] = self.genes[:row]
+            self.genes = grown
+        self.genes[row:row + len(creatures)] = [c.genome.phenotype.genes for c in creatures]
+        
+        for creature in creatures:
+            creature.row = row
+            self.by_id[creature.id] = creature
+            row += 1
+        
+        self.creatures.extend(creatures)
+    
+    def remove(self, creatures):
+        """
+        Retire un lot de créatures: chaque trou est comblé par la dernière
+        créature de la liste. Les lignes sont traitées par ordre décroissant
+        pour qu'une créature déplacée ne soit jamais elle-même à retirer.
+        """
+        rows = sorted({c.row for c in creatures if c in self}, reverse=True)
+        
+        for row in rows:
+            removed = self.creatures[row]
+            del self.by_id[removed.id]
+            removed.row = -1
+            
+            last = self.creatures.pop()
+            if last is not removed:
+                self.creatures[row] = last
+                self.genes[row] = self.genes[len(self.creatures)]
+                last.row = row
+    
+    def gene_matrix(self):
+        """Vecteurs de traits des créatures vivantes (vue, ligne i = creatures[i])."""
+        return self.genes[:len(self.creatures)]
@@ -0,0 +1,76 @@
+import numpy as np
+
+class SpatialIndex:
+    """
+    Index spatial sur une grille uniforme de cases carrées.
+    Les points sont triés par case; la recherche des paires proches ne
+    compare que les points de cases voisines, sans double boucle Python.
+    """
+    # Demi-voisinage: chaque paire de cases voisines n'est visitée qu'une fois
+    HALF_NEIGHBORHOOD = ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1))
+    
+    def __init__(self, x, y, cell_size):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.cell_size = cell_size
+        
+        # Case de chaque point (décalée d'une case pour que les voisins restent positifs)
+        bucket_x = np.floor(self.x / cell_size).astype(np.int64)
+        bucket_y = np.floor(self.y / cell_size).astype(np.int64)
+        if len(self.x):
+            bucket_x -= bucket_x.min()
+            bucket_y -= bucket_y.min() - 1
+        self.stride = int(bucket_y.max()) + 2 if len(self.y) else 1
+        keys = bucket_x * self.stride + bucket_y
+        
+        # Points triés par case
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+    
+    def __len__(self):
+        return len(self.x)
+    
+    def pairs(self, radius):
+        """
+        Retourne les paires de points (first, second) à une distance
+        strictement inférieure à radius, chaque paire une seule fois.
+        radius doit être inférieur ou égal à la taille des cases.
+        """
+        count = len(self.x)
+        first_parts = []
+        second_parts = []
+        positions = np.arange(count)
+        
+        for dx, dy in SpatialIndex.HALF_NEIGHBORHOOD:
+            offset = dx * self.stride + dy
+            end = np.searchsorted(self.sorted_keys, self.sorted_keys + offset, side="right")
+            if offset == 0:
+                # Même case: seulement les points suivants dans l'ordre trié
+                start = positions + 1
+            else:
+                start = np.searchsorted(self.sorted_keys, self.sorted_keys + offset, side="left")
+            
+            # Énumérer tous les candidats (a, b) sans boucle Python
+            counts = np.maximum(end - start, 0)
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            a = np.repeat(positions, counts)
+            first_of_run = np.cumsum(counts) - counts
+            b = start[a] + (np.arange(total) - first_of_run[a])
+            
+            first_parts.append(self.order[a])
+            second_parts.append(self.order[b])
+        
+        if not first_parts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        
+        first = np.concatenate(first_parts)
+        second = np.concatenate(second_parts)
+        
+        # Garder les paires réellement proches
+        distance_sq = (self.x[first] - self.x[second]) ** 2 + (self.y[first] - self.y[second]) ** 2
+        close = distance_sq < radius ** 2
+        
+        return first[close], second[close]
@@ -0,0 +1,357 @@
+import itertools
+import time
+import numpy as np
+from config import Config
+from creatures.phenotype import Phenotype
+
+class Speciation:
+    """
+    Regroupement de la population en espèces par k-means vectorisé.
+    Calculé une seule fois par génération; les étiquettes et les centres
+    sont partagés par l'évolution, les statistiques et l'interface.
+    Chaque jour repart des centres de la veille: les espèces gardent un
+    identifiant persistant et leurs naissances, divisions et extinctions
+    sont suivies.
+    """
+    # Traits utilisés pour la classification
+    TRAITS = (
+        "size", "speed", "strength", "vision_range",
+        "heat_tolerance", "cold_tolerance", "water_affinity", "mountain_affinity",
+        "can_swim", "can_climb",
+    )
+    INDEX = {trait: i for i, trait in enumerate(TRAITS)}
+    COLUMNS = np.array([Phenotype.INDEX[trait] for trait in TRAITS])
+    
+    # Paramètres du clustering
+    MIN_CREATURES = 10    # En dessous, une seule espèce
+    MAX_SPECIES = 5       # Nombre maximal de clusters
+    TOLERANCE = 0.01      # Déplacement maximal des centres pour considérer la convergence
+    MATCH_DISTANCE = 15.0 # Distance maximale entre le centre d'une espèce et son centre de la veille
+    ASSIGN_CHUNK = 16384  # Créatures assignées par bloc (mémoire bornée, échéance vérifiée entre les blocs)
+    
+    def __init__(self):
+        # Génération du dernier regroupement
+        self.generation = None
+        
+        # Cluster de chaque créature (aligné sur la population au moment du calcul,
+        # -1 si le budget de temps a été épuisé avant son assignation) et
+        # identifiant d'espèce de chaque cluster (dernier élément: 0 pour -1)
+        self.cluster_labels = None
+        self.label_species = np.zeros(1, dtype=np.int64)
+        
+        # Faux si les effectifs sont estimés sur une partie seulement de la population
+        self.complete = True
+        
+        # Centre, effectif et identifiant persistant de chaque espèce
+        self.centroids = np.zeros((0, len(Speciation.TRAITS)))
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.species_ids = np.zeros(0, dtype=np.int64)
+        self._ids = itertools.count(1)
+        
+        # Changements du dernier regroupement et historique par génération
+        self.changes = {"births": [], "splits": [], "extinctions": []}
+        self.history = []
+    
+    @property
+    def labels(self):
+        """
+        Espèce de chaque créature (0 si non assignée), None si la population
+        est trop petite. Calculé à la demande pour ne pas allonger update().
+        """
+        if self.cluster_labels is None:
+            return None
+        return self.label_species[self.cluster_labels]
+    
+    @property
+    def num_species(self):
+        """Nombre d'espèces non vides (au moins une)."""
+        return max(1, int(np.count_nonzero(self.counts)))
+    
+    def species_counts(self):
+        """Effectif de chaque espèce (par identifiant) sous forme de dictionnaire."""
+        return {int(species_id): int(count) for species_id, count in zip(self.species_ids, self.counts)}
+    
+    def species_traits(self, species_id):
+        """Traits moyens d'une espèce (centre de son cluster)."""
+        row = int(np.flatnonzero(self.species_ids == species_id)[0])
+        return {trait: float(self.centroids[row, i]) for i, trait in enumerate(Speciation.TRAITS)}
+    
+    def update(self, population):
+        """
+        Regroupe la population en espèces, au plus une fois par génération,
+        en repartant des centres de la génération précédente.
+        Au-delà de Config.SPECIATION_SAMPLE_SIZE créatures, les centres sont
+        appris par mini-lots sur un échantillon puis toute la population est
+        assignée par blocs. Le temps de calcul est borné par
+        Config.SPECIATION_TIME_BUDGET (en millisecondes): l'échéance est
+        vérifiée pendant l'initialisation, les itérations et entre les blocs
+        de l'assignation; si elle est dépassée, les effectifs sont estimés à
+        partir des créatures déjà assignées.
+        """
+        if self.generation == population.generation:
+            return
+        
+        deadline = time.perf_counter() + Config.SPECIATION_TIME_BUDGET / 1000
+        self.generation = population.generation
+        creatures = population.creatures
+        previous_ids = self.species_ids
+        previous_centroids = self.centroids
+        
+        # Seuil minimal de créatures pour la détection d'espèces
+        if len(creatures) < Speciation.MIN_CREATURES:
+            self.cluster_labels = None
+            self.centroids = np.zeros((0, len(Speciation.TRAITS)))
+            self.counts = np.zeros(0, dtype=np.int64)
+            self.species_ids = np.zeros(0, dtype=np.int64)
+            self.record_changes([], [], previous_ids.tolist())
+            return
+        
+        # Traits tenus à jour par le registre (pas de parcours des créatures);
+        # les colonnes utiles ne sont extraites que pour les lignes traitées
+        genes = population.registry.gene_matrix()
+        
+        # Nombre d'espèces potentielles
+        k = min(Speciation.MAX_SPECIES, max(1, len(genes) // 20))
+        
+        # Démarrage à chaud: les espèces les plus nombreuses de la veille d'abord
+        keep = np.argsort(-self.counts, kind="stable")[:k]
+        sample_size = Config.SPECIATION_SAMPLE_SIZE
+        if sample_size and len(genes) > sample_size:
+            # Échantillon uniforme (avec remise) de la population pour apprendre les centres
+            sample = genes[np.random.randint(len(genes), size=sample_size)][:, Speciation.COLUMNS]
+            # (au plus la moitié du budget restant, l'autre moitié revient à l'assignation)
+            learning_deadline = time.perf_counter() + (deadline - time.perf_counter()) / 2
+            centroids = Speciation.minibatch_kmeans(
+                sample, k, centroids=previous_centroids[keep], deadline=learning_deadline
+            )
+            
+            # Assignation de la population dans le budget restant, puis centres exacts des espèces
+            labels, counts, sums = Speciation.assign_population(genes, centroids, deadline=deadline)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            
+            # Budget épuisé: les créatures assignées forment un échantillon systématique
+            assigned = int(counts.sum())
+            self.complete = assigned == len(genes)
+            if not self.complete:
+                counts = np.round(counts * len(genes) / assigned).astype(np.int64)
+        else:
+            labels, centroids, counts = Speciation.kmeans(
+                genes[:, Speciation.COLUMNS], k, centroids=previous_centroids[keep], deadline=deadline
+            )
+            self.complete = True
+        
+        # Les clusters vides disparaissent
+        filled = counts > 0
+        remap = np.cumsum(filled) - 1
+        self.centroids = centroids[filled]
+        self.counts = counts[filled]
+        
+        # Un cluster parti du centre d'une espèce de la veille, et peu déplacé, garde son identifiant
+        species_ids = np.zeros(len(centroids), dtype=np.int64)
+        continued = set()
+        for row in range(min(len(keep), len(centroids))):
+            shift = np.sqrt(np.sum((centroids[row] - previous_centroids[keep[row]]) ** 2))
+            if filled[row] and shift <= Speciation.MATCH_DISTANCE:
+                species_ids[row] = previous_ids[keep[row]]
+                continued.add(int(previous_ids[keep[row]]))
+        
+        # Les autres sont de nouvelles espèces: division d'une espèce proche encore présente, ou apparition
+        births = []
+        splits = []
+        for row in np.flatnonzero(filled & (species_ids == 0)).tolist():
+            species_ids[row] = next(self._ids)
+            if len(previous_centroids):
+                distances = np.sqrt(np.sum((previous_centroids - centroids[row]) ** 2, axis=1))
+                nearest = int(np.argmin(distances))
+                parent_id = int(previous_ids[nearest])
+                if parent_id in continued and distances[nearest] <= Speciation.MATCH_DISTANCE * 2:
+                    splits.append((parent_id, int(species_ids[row])))
+                    continue
+            births.append(int(species_ids[row]))
+        
+        self.species_ids = species_ids[filled]
+        self.cluster_labels = labels
+        self.label_species = np.append(np.where(filled, species_ids, 0), 0)
+        
+        extinctions = [int(species_id) for species_id in previous_ids if int(species_id) not in continued]
+        self.record_changes(births, splits, extinctions)
+    
+    def record_changes(self, births, splits, extinctions):
+        """Mémorise les changements d'espèces de la génération courante."""
+        self.changes = {"births": births, "splits": splits, "extinctions": extinctions}
+        
+        if births or splits or extinctions:
+            self.history.append({
+                "generation": self.generation,
+                "births": births,
+                "splits": splits,
+                "extinctions": extinctions
+            })
+    
+    @staticmethod
+    def kmeans(data, k, max_iterations=None, tolerance=None, centroids=None, deadline=None):
+        """
+        k-means vectorisé avec initialisation k-means++ et arrêt dès la
+        convergence. centroids (optionnel) sert de point de départ; les
+        centres manquants jusqu'à k sont tirés par k-means++.
+        deadline (time.perf_counter) interrompt les itérations.
+        Retourne (étiquettes, centres, effectifs).
+        """
+        max_iterations = max_iterations or Config.SPECIATION_MAX_ITERATIONS
+        tolerance = Speciation.TOLERANCE if tolerance is None else tolerance
+        
+        centroids = Speciation.seed_centroids(data, k, centroids, deadline=deadline)
+        labels = None
+        
+        for _ in range(max_iterations):
+            previous = labels
+            labels = Speciation.assign(data, centroids)
+            
+            # Nouveaux centres (les clusters vides gardent leur centre)
+            counts, new_centroids = Speciation.cluster_means(data, labels, centroids)
+            shift = np.max(np.abs(new_centroids - centroids))
+            centroids = new_centroids
+            
+            if shift <= tolerance or (previous is not None and np.array_equal(labels, previous)):
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        
+        return labels, centroids, counts
+    
+    @staticmethod
+    def minibatch_kmeans(data, k, batch_size=None, max_iterations=None, tolerance=None, centroids=None, deadline=None):
+        """
+        k-means par mini-lots: chaque itération tire un lot de points et
+        rapproche les centres de la moyenne de leurs points, avec un pas
+        décroissant (1 / nombre de points déjà vus par centre).
+        Retourne les centres.
+        """
+        batch_size = min(batch_size or Config.SPECIATION_BATCH_SIZE, len(data))
+        max_iterations = max_iterations or Config.SPECIATION_MAX_ITERATIONS
+        tolerance = Speciation.TOLERANCE if tolerance is None else tolerance
+        
+        centroids = Speciation.seed_centroids(data, k, centroids, deadline=deadline)
+        seen = np.zeros(k)
+        
+        for _ in range(max_iterations):
+            batch = data[np.random.randint(len(data), size=batch_size)]
+            labels = Speciation.assign(batch, centroids)
+            counts, means = Speciation.cluster_means(batch, labels, centroids)
+            
+            # Pas d'apprentissage de chaque centre
+            seen += counts
+            rate = counts / np.maximum(seen, 1)
+            new_centroids = centroids + rate[:, None] * (means - centroids)
+            shift = np.max(np.abs(new_centroids - centroids))
+            centroids = new_centroids
+            
+            if shift <= tolerance:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        
+        return centroids
+    
+    @staticmethod
+    def seed_centroids(data, k, initial=None, deadline=None):
+        """
+        Initialisation k-means++: centres éloignés tirés proportionnellement
+        au carré de la distance, en complétant les centres initial éventuels.
+        Une fois deadline dépassée, les centres restants sont tirés au hasard.
+        """
+        centroids = np.empty((k, data.shape[1]))
+        start = 0 if initial is None else min(len(initial), k)
+        if start:
+            centroids[:start] = initial[:start]
+        else:
+            centroids[0] = data[np.random.randint(len(data))]
+            start = 1
+        closest = np.min(Speciation.squared_distances(data, centroids[:start]), axis=1)
+        
+        for i in range(start, k):
+            if deadline is not None and time.perf_counter() > deadline:
+                centroids[i:] = data[np.random.randint(len(data), size=k - i)]
+                break
+            
+            total = closest.sum()
+            if total > 0:
+                index = np.searchsorted(np.cumsum(closest), np.random.random() * total, side="right")
+                index = min(index, len(data) - 1)
+            else:
+                index = np.random.randint(len(data))
+            centroids[i] = data[index]
+            closest = np.minimum(closest, np.sum((data - centroids[i]) ** 2, axis=1))
+        
+        return centroids
+    
+    @staticmethod
+    def assign(data, centroids):
+        """
+        Centre le plus proche de chaque point, par blocs de lignes pour
+        borner la taille des matrices de distances.
+        """
+        labels = np.empty(len(data), dtype=np.int64)
+        for start in range(0, len(data), Speciation.ASSIGN_CHUNK):
+            block = data[start:start + Speciation.ASSIGN_CHUNK]
+            labels[start:start + len(block)] = np.argmin(Speciation.squared_distances(block, centroids), axis=1)
+        
+        return labels
+    
+    @staticmethod
+    def assign_population(genes, centroids, deadline=None):
+        """
+        Assigne toute la population (matrice complète des traits, colonnes de
+        classification extraites bloc par bloc) en cumulant effectifs et
+        sommes par cluster. Chaque bloc prend une ligne sur step, de sorte
+        que les blocs déjà traités forment un échantillon de la population.
+        Un bloc n'est commencé que s'il peut finir avant deadline (durée
+        estimée sur le bloc précédent); les blocs restants ne sont pas traités
+        (étiquette -1). Le premier l'est toujours.
+        Retourne (étiquettes, effectifs, sommes) des créatures assignées.
+        """
+        k = len(centroids)
+        labels = np.full(len(genes), -1, dtype=np.int64)
+        counts = np.zeros(k, dtype=np.int64)
+        sums = np.zeros((k, len(Speciation.TRAITS)))
+        
+        step = max(1, -(-len(genes) // Speciation.ASSIGN_CHUNK))
+        block_time = 0.0
+        for offset in range(step):
+            started = time.perf_counter()
+            if offset and deadline is not None and started + block_time > deadline:
+                break
+            
+            block = genes[offset::step][:, Speciation.COLUMNS]
+            block_labels = np.argmin(Speciation.squared_distances(block, centroids), axis=1)
+            labels[offset::step] = block_labels
+            counts += np.bincount(block_labels, minlength=k)
+            sums += np.stack([
+                np.bincount(block_labels, weights=block[:, j], minlength=k) for j in range(block.shape[1])
+            ], axis=1)
+            block_time = time.perf_counter() - started
+        
+        return labels, counts, sums
+    
+    @staticmethod
+    def squared_distances(data, centroids):
+        """Matrice des carrés des distances points x centres."""
+        return (
+            np.sum(data ** 2, axis=1)[:, None]
+            - 2 * np.dot(data, centroids.T)
+            + np.sum(centroids ** 2, axis=1)[None, :]
+        )
+    
+    @staticmethod
+    def cluster_means(data, labels, centroids):
+        """Effectif et moyenne de chaque cluster (sommes groupées par bincount)."""
+        k = len(centroids)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=data[:, j], minlength=k) for j in range(data.shape[1])], axis=1)
+        
+        means = centroids.copy()
+        filled = counts > 0
+        means[filled] = sums[filled] / counts[filled, None]
+        
+        return counts, means
@@ -1,230 +1,212 @@
 import numpy as np
 from config import Config
+from creatures.phenotype import Phenotype
+from simulation.trait_statistics import TraitStatistics
+from simulation.trait_histograms import TraitHistograms
+from simulation.trait_covariance import TraitCovariance
+from simulation.history import History
 
 class Statistics:
     """
     Collecte et analyse les statistiques d'évolution de la simulation.
     Permet de suivre les tendances d'adaptation des créatures au fil du temps.
+    Les historiques sont des séries en colonnes de mémoire bornée (History).
     """
-    def __init__(self):
-        # Historique de population
-        self.population_history = []
+    # Colonnes de l'historique des traits (moyenne, minimum, maximum de chaque trait)
+    TRAIT_COLUMNS = tuple(
+        trait + "_" + stat for trait in Phenotype.TRAITS for stat in ("mean", "min", "max")
+    )
+    
+    # Colonnes de l'historique environnemental
+    ENVIRONMENT_COLUMNS = tuple(Config.ENVIRONMENTS.keys()) + ("avg_temperature", "avg_humidity", "total_food")
+    
+    def __init__(self, log=None):
+        # Journal sur disque (StatsLog) ou None
+        self.log = log
+        
+        # Historique de population (par génération)
+        self.population_history = History(("count",))
+        
+        # Historique des traits génétiques par génération
+        self.trait_history = History(Statistics.TRAIT_COLUMNS)
         
-        # Historique des traits génétiques moyens par génération
-        self.trait_history = {}
+        # Moments, histogrammes et covariances des traits de la population vivante (mis à jour en continu)
+        self.traits = TraitStatistics()
+        self.histograms = TraitHistograms()
+        self.covariance = TraitCovariance()
         
-        # Espèces détectées et leur évolution
+        # Espèces de la dernière génération regroupée et historique de leur nombre
         self.species = {}
-        self.species_counts = []
+        self.species_counts = History(("num_species", "largest_species"))
         
         # Journalisation des événements importants
         self.events = []
         
-        # Métriques environnementales
-        self.environment_metrics = []
+        # Métriques environnementales (par jour)
+        self.environment_metrics = History(Statistics.ENVIRONMENT_COLUMNS)
+        
+        # Numéro de version, incrémenté à chaque nouvelle statistique enregistrée
+        self.version = 0
+        
+        # Résumé mis en cache et version des statistiques dont il est issu
+        self._summary = None
+        self._summary_version = None
+    
+    def record_births(self, creatures):
+        """Ajoute des naissances aux moments, histogrammes et covariances des traits."""
+        genes = TraitStatistics.genes_of(creatures)
+        self.traits.add(genes)
+        self.histograms.add(genes)
+        self.covariance.add(genes)
     
-    def update_population_stats(self, generation, population):
-        """Met à jour les statistiques de population pour une génération."""
+    def record_deaths(self, creatures):
+        """Retire des morts des moments, histogrammes et covariances des traits."""
+        genes = TraitStatistics.genes_of(creatures)
+        self.traits.remove(genes)
+        self.histograms.remove(genes)
+        self.covariance.remove(genes)
+    
+    def record_tick(self, tick, generation, count, births, deaths):
+        """Enregistre les métriques d'une frame dans le journal sur disque."""
+        if self.log:
+            self.log.append("ticks", {
+                "tick": tick,
+                "generation": generation,
+                "count": count,
+                "births": births,
+                "deaths": deaths
+            })
+    
+    def update_population_stats(self, generation, population, snapshot=False):
+        """
+        Met à jour les statistiques de population pour une génération.
+        Les moments des traits sont tenus à jour par les naissances et les
+        morts; snapshot recalcule tout sur la population et regroupe les
+        espèces (fin de journée ou à la demande).
+        """
+        # Nouvelles statistiques: le résumé en cache est périmé
+        self.version += 1
+        
         # Enregistrer la taille de la population
-        self.population_history.append({
-            "generation": generation,
-            "count": len(population.creatures)
-        })
+        self.population_history.record(generation, {"count": len(population.creatures)})
+        
+        if snapshot:
+            genes = TraitStatistics.genes_of(population.creatures)
+            self.traits.reset(genes)
+            self.histograms.reset(genes)
+            self.histograms.store(generation)
+            self.covariance.reset(genes)
+            self.covariance.store(generation)
         
         # Si pas de créatures, ne pas calculer les autres statistiques
         if not population.creatures:
             return
         
-        # Calculer les moyennes des traits
-        trait_sums = {}
-        trait_mins = {}
-        trait_maxs = {}
-        
-        for creature in population.creatures:
-            for trait, value in creature.genome.traits.items():
-                if trait not in trait_sums:
-                    trait_sums[trait] = 0
-                    trait_mins[trait] = value
-                    trait_maxs[trait] = value
-                else:
-                    trait_sums[trait] += value
-                    trait_mins[trait] = min(trait_mins[trait], value)
-                    trait_maxs[trait] = max(trait_maxs[trait], value)
-        
         # Enregistrer les statistiques de traits
-        self.trait_history[generation] = {
-            "averages": {
-                trait: value / len(population.creatures)
-                for trait, value in trait_sums.items()
-            },
-            "mins": trait_mins,
-            "maxs": trait_maxs
-        }
+        mins, maxs = self.traits.extremes(population)
+        moments = np.stack((self.traits.means(), mins, maxs), axis=1).ravel()
+        self.trait_history.record(generation, dict(zip(Statistics.TRAIT_COLUMNS, moments.tolist())))
         
         # Grouper les créatures en espèces basées sur leurs traits
-        self.identify_species(generation, population)
+        if snapshot:
+            self.identify_species(generation, population)
+            self.log_day(generation, population)
+    
+    def log_day(self, generation, population):
+        """Enregistre l'instantané d'une génération dans le journal sur disque."""
+        if not self.log:
+            return
+        
+        row = {"generation": generation, "count": len(population.creatures)}
+        for trait, mean, variance in zip(Phenotype.TRAITS, self.traits.means().tolist(), self.traits.variances().tolist()):
+            row[trait + "_mean"] = mean
+            row[trait + "_variance"] = variance
+        row["num_species"] = len(self.species.get(generation, {}))
+        
+        self.log.append("days", row)
     
     def identify_species(self, generation, population):
         """
         Identifie les espèces émergentes en fonction des traits génétiques.
-        Utilise un algorithme de clustering simple.
+        Lit le regroupement partagé de la population (calculé une fois par génération).
         """
-        # Liste des créatures avec leurs traits clés pour la classification
-        creatures_data = []
-        for creature in population.creatures:
-            genome = creature.genome.traits
-            
-            # Sélectionner les traits pour la classification (traits physiques principalement)
-            species_traits = [
-                genome["size"],
-                genome["speed"],
-                genome["vision_range"],
-                genome["heat_tolerance"],
-                genome["cold_tolerance"],
-                genome["can_swim"],
-                genome["can_climb"]
-            ]
-            creatures_data.append(species_traits)
-        
-        # Si trop peu de créatures, ne pas faire de clustering
-        if len(creatures_data) < 5:
-            return
-        
-        # Convertir en tableau numpy pour les calculs
-        data = np.array(creatures_data)
-        
-        # Algorithme de clustering simple (k-means simplifié)
-        # Note: Pour un système plus complexe, utiliser scikit-learn
-        # Ici, nous utilisons simplement une approche basée sur la distance
-        
-        # Nombre de clusters (espèces potentielles)
-        k = min(5, len(data) // 10 + 1)  # Adapter selon la taille de la population
+        speciation = population.speciation
+        speciation.update(population)
         
-        # Initialiser les centres avec k créatures aléatoires
-        centers_idx = np.random.choice(len(data), k, replace=False)
-        centers = data[centers_idx]
-        
-        # Assigner chaque créature à un cluster
-        clusters = {}
-        for i, creature_data in enumerate(data):
-            # Trouver le centre le plus proche
-            min_dist = float('inf')
-            best_cluster = -1
-            
-            for cluster_id, center in enumerate(centers):
-                # Distance euclidienne simple
-                dist = np.sum((creature_data - center) ** 2)
-                if dist < min_dist:
-                    min_dist = dist
-                    best_cluster = cluster_id
-            
-            # Assigner au cluster
-            if best_cluster not in clusters:
-                clusters[best_cluster] = []
-            clusters[best_cluster].append(i)
+        # Si trop peu de créatures, pas de clustering
+        if speciation.cluster_labels is None:
+            return
         
         # Compter les créatures par espèce
-        species_counts = {i: len(members) for i, members in clusters.items()}
+        species_counts = {
+            species_id: count for species_id, count in speciation.species_counts().items() if count > 0
+        }
         
         # Enregistrer le résultat
-        self.species_counts.append({
-            "generation": generation,
-            "species_counts": species_counts
+        self.species_counts.record(generation, {
+            "num_species": len(species_counts),
+            "largest_species": max(species_counts.values())
         })
         
-        # Définir les caractéristiques de chaque espèce
-        self.species[generation] = {}
-        for species_id, members in clusters.items():
-            if len(members) > 0:
-                # Calculer les moyennes des traits pour cette espèce
-                species_data = data[members]
-                species_center = np.mean(species_data, axis=0)
-                
-                # Enregistrer les caractéristiques de l'espèce
-                self.species[generation][species_id] = {
-                    "count": len(members),
-                    "traits": {
-                        "size": species_center[0],
-                        "speed": species_center[1],
-                        "vision_range": species_center[2],
-                        "heat_tolerance": species_center[3],
-                        "cold_tolerance": species_center[4],
-                        "can_swim": species_center[5] > 0.5,  # Convertir en booléen
-                        "can_climb": species_center[6] > 0.5  # Convertir en booléen
-                    }
+        # Définir les caractéristiques de chaque espèce (centre de son cluster);
+        # seule la dernière génération est conservée
+        self.species = {generation: {}}
+        for species_id, count in species_counts.items():
+            species_center = speciation.species_traits(species_id)
+            
+            # Enregistrer les caractéristiques de l'espèce
+            self.species[generation][species_id] = {
+                "count": count,
+                "traits": {
+                    "size": species_center["size"],
+                    "speed": species_center["speed"],
+                    "vision_range": species_center["vision_range"],
+                    "heat_tolerance": species_center["heat_tolerance"],
+                    "cold_tolerance": species_center["cold_tolerance"],
+                    "can_swim": species_center["can_swim"] > 0.5,  # Convertir en booléen
+                    "can_climb": species_center["can_climb"] > 0.5  # Convertir en booléen
                 }
+            }
     
     def log_event(self, day, event_type, description):
         """Enregistre un événement important dans la simulation."""
-        self.events.append({
+        event = {
             "day": day,
             "type": event_type,
             "description": description
-        })
-    
-    def update_environment_metrics(self, day, grid):
-        """Enregistre des métriques sur l'environnement."""
-        # Compter les types de terrain
-        terrain_counts = {
-            "water": 0,
-            "desert": 0,
-            "forest": 0,
-            "mountain": 0
         }
+        self.events.append(event)
         
-        # Moyennes de température et d'humidité
-        avg_temp = 0
-        avg_humidity = 0
-        
-        # Quantité totale de nourriture
-        total_food = 0
-        
-        # Parcourir la grille
-        cell_count = grid.width * grid.height
-        for x in range(grid.width):
-            for y in range(grid.height):
-                cell = grid.cells[x, y]
-                
-                # Compter les types de terrain
-                terrain_counts[cell.terrain_type] += 1
-                
-                # Ajouter à la moyenne
-                avg_temp += cell.temperature
-                avg_humidity += cell.humidity
-                
-                # Compter la nourriture
-                total_food += cell.food
-        
-        # Calculer les moyennes
-        avg_temp /= cell_count
-        avg_humidity /= cell_count
-        
-        # Enregistrer les métriques
-        self.environment_metrics.append({
-            "day": day,
-            "terrain_counts": terrain_counts,
-            "avg_temperature": avg_temp,
-            "avg_humidity": avg_humidity,
-            "total_food": total_food
-        })
+        if self.log:
+            self.log.log_event(event)
+    
+    def update_environment_metrics(self, day, grid):
+        """Enregistre des métriques sur l'environnement (totaux tenus à jour par la grille)."""
+        aggregates = grid.aggregates
+        
+        # Types de terrain, moyennes de température et d'humidité, nourriture totale
+        metrics = aggregates.terrain_distribution()
+        metrics["avg_temperature"] = aggregates.mean("temperature")
+        metrics["avg_humidity"] = aggregates.mean("humidity")
+        metrics["total_food"] = aggregates.total("food")
+        self.environment_metrics.record(day, metrics)
+        self.version += 1
+        
+        if self.log:
+            metrics["day"] = day
+            self.log.append("environment", metrics)
     
     def get_population_trend(self, last_n_generations=10):
         """Récupère la tendance de population sur les n dernières générations."""
-        if len(self.population_history) < 2:
-            return 0  # Pas assez de données
-        
         # Limiter aux n dernières générations
-        history = self.population_history[-last_n_generations:]
+        history = self.population_history.tail("count", last_n_generations)
         
         # Calculer la pente de la tendance
         if len(history) < 2:
-            return 0
+            return 0  # Pas assez de données
         
         # Simple calcul de pente entre le début et la fin
-        start_count = history[0]["count"]
-        end_count = history[-1]["count"]
-        
-        return (end_count - start_count) / len(history)
+        return (history[-1] - history[0]) / len(history)
     
     def get_dominant_species(self, generation=None):
         """Récupère l'espèce dominante à une génération donnée."""
@@ -247,32 +229,51 @@ class Statistics:
     
     def get_trait_evolution(self, trait, start_gen=0, end_gen=None):
         """Récupère l'évolution d'un trait au fil des générations."""
-        if not self.trait_history:
+        if trait not in Phenotype.INDEX:
             return []
         
-        if end_gen is None:
-            end_gen = max(self.trait_history.keys())
+        generations, averages, mins, maxs = self.get_trait_series(trait, start_gen, end_gen)
         
-        evolution = []
-        for gen in range(start_gen, end_gen + 1):
-            if gen in self.trait_history and trait in self.trait_history[gen]["averages"]:
-                evolution.append({
-                    "generation": gen,
-                    "average": self.trait_history[gen]["averages"][trait],
-                    "min": self.trait_history[gen]["mins"][trait],
-                    "max": self.trait_history[gen]["maxs"][trait]
-                })
+        return [
+            {"generation": int(gen), "average": average, "min": low, "max": high}
+            for gen, average, low, high in zip(generations.tolist(), averages.tolist(), mins.tolist(), maxs.tolist())
+        ]
+    
+    def get_trait_series(self, trait, start_gen=None, end_gen=None):
+        """
+        Évolution d'un trait sous forme de tableaux (générations, moyennes,
+        minimums, maximums), lus directement dans l'historique. Les
+        générations anciennes sont regroupées par tranches.
+        """
+        generations, _, averages, _ = self.trait_history.range(trait + "_mean", start_gen, end_gen)
+        _, mins, _, _ = self.trait_history.range(trait + "_min", start_gen, end_gen)
+        _, _, _, maxs = self.trait_history.range(trait + "_max", start_gen, end_gen)
         
-        return evolution
+        return generations, averages, mins, maxs
+    
+    def get_trait_correlation(self, trait_a, trait_b, generation=None):
+        """Corrélation entre deux traits (génération courante par défaut)."""
+        correlation = self.covariance.correlation(generation)
+        return float(correlation[Phenotype.INDEX[trait_a], Phenotype.INDEX[trait_b]])
     
     def get_summary(self):
+        """
+        Résumé des statistiques actuelles de la simulation, recalculé
+        seulement quand de nouvelles statistiques ont été enregistrées.
+        """
+        if self._summary_version != self.version:
+            self._summary = self.build_summary()
+            self._summary_version = self.version
+        return self._summary
+    
+    def build_summary(self):
         """Génère un résumé des statistiques actuelles de la simulation."""
-        if not self.population_history:
+        if not len(self.population_history):
             return "Pas encore de données statistiques disponibles."
         
         # Dernière génération
-        last_gen = self.population_history[-1]["generation"]
-        current_pop = self.population_history[-1]["count"]
+        last_gen = int(self.population_history.last_key())
+        current_pop = int(self.population_history.last("count"))
         
         # Tendance de population
         trend = self.get_population_trend()
@@ -0,0 +1,163 @@
+import glob
+import json
+import os
+import queue
+import threading
+import numpy as np
+from config import Config
+
+class StatsLog:
+    """
+    Journal des statistiques sur disque, en ajout seul.
+    Chaque flux (frames, jours, environnement...) est découpé en blocs .npy
+    (tableaux structurés) écrits par un fil d'exécution en arrière-plan;
+    les événements sont ajoutés à un fichier JSON lines. Un bloc n'apparaît
+    sous son nom définitif qu'une fois complet, il peut donc être relu
+    (ou projeté en mémoire) pendant la simulation.
+    Les colonnes d'un flux sont fixées par sa première ligne; une erreur du
+    fil d'écriture est relancée par l'appel suivant à append ou close.
+    """
+    def __init__(self, directory, chunk_size=None):
+        self.directory = directory
+        self.chunk_size = chunk_size or Config.STATS_LOG_CHUNK_SIZE
+        
+        # Colonnes, lignes en attente et nombre de blocs déjà envoyés, par flux
+        self.schemas = {}
+        self.buffers = {}
+        self.chunks = {}
+        self.events = []
+        
+        # Exception levée par le fil d'écriture (relancée dans le fil principal)
+        self.error = None
+        
+        # Écriture en arrière-plan
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self._run, daemon=True)
+        self.writer.start()
+    
+    def append(self, stream, row):
+        """
+        Ajoute une ligne (dictionnaire de valeurs numériques) à un flux.
+        La ligne doit avoir exactement les colonnes de la première ligne du flux.
+        """
+        self._check_writer()
+        
+        columns = self.schemas.setdefault(stream, tuple(row.keys()))
+        if len(row) != len(columns) or any(column not in row for column in columns):
+            raise ValueError(
+                f"Colonnes du flux {stream!r} attendues: {list(columns)}, reçues: {list(row.keys())}"
+            )
+        
+        buffer = self.buffers.setdefault(stream, [])
+        buffer.append(row)
+        
+        if len(buffer) >= self.chunk_size:
+            self._send(stream)
+    
+    def log_event(self, event):
+        """Ajoute un événement (dictionnaire) au journal des événements."""
+        self._check_writer()
+        self.events.append(event)
+        
+        if len(self.events) >= self.chunk_size:
+            self._send_events()
+    
+    def flush(self):
+        """Envoie toutes les lignes en attente à l'écriture (blocs partiels compris)."""
+        self._check_writer()
+        for stream in list(self.buffers):
+            if self.buffers[stream]:
+                self._send(stream)
+        if self.events:
+            self._send_events()
+    
+    def close(self):
+        """Vide les tampons et attend la fin des écritures."""
+        if self.writer.is_alive():
+            self.flush()
+            self.queue.put(None)
+            self.writer.join()
+        self._check_writer()
+    
+    @staticmethod
+    def read(directory, stream, mmap=True):
+        """
+        Parcourt les blocs complets d'un flux, du plus ancien au plus récent
+        (projetés en mémoire par défaut).
+        """
+        for path in sorted(glob.glob(os.path.join(directory, stream, "chunk_*.npy"))):
+            yield np.load(path, mmap_mode="r" if mmap else None)
+    
+    @staticmethod
+    def read_events(directory):
+        """Parcourt les événements enregistrés."""
+        path = os.path.join(directory, "events.jsonl")
+        if not os.path.exists(path):
+            return
+        
+        with open(path, encoding="utf-8") as events_file:
+            for line in events_file:
+                yield json.loads(line)
+    
+    def _send(self, stream):
+        """Convertit les lignes en attente d'un flux en tableau et les envoie à l'écriture."""
+        rows = self.buffers[stream]
+        self.buffers[stream] = []
+        
+        columns = self.schemas[stream]
+        dtype = np.dtype([(column, np.float64) for column in columns])
+        chunk = np.array([tuple(row[column] for column in columns) for row in rows], dtype=dtype)
+        
+        index = self.chunks.get(stream, 0)
+        self.chunks[stream] = index + 1
+        self.queue.put(("chunk", stream, index, chunk))
+    
+    def _send_events(self):
+        """Envoie les événements en attente à l'écriture."""
+        events = self.events
+        self.events = []
+        self.queue.put(("events", None, None, events))
+    
+    def _check_writer(self):
+        """Relance l'exception du fil d'écriture, s'il s'est arrêté sur une erreur."""
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise RuntimeError("Échec de l'écriture du journal des statistiques") from error
+    
+    def _run(self):
+        """
+        Boucle du fil d'écriture. Une erreur arrête le fil (plus rien n'est
+        mis en file ensuite) et est conservée pour le fil principal.
+        """
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                
+                kind, stream, index, data = item
+                if kind == "chunk":
+                    self._write_chunk(stream, index, data)
+                else:
+                    self._write_events(data)
+        except Exception as error:
+            self.error = error
+    
+    def _write_chunk(self, stream, index, chunk):
+        """Écrit un bloc sous un nom temporaire puis le renomme (bloc toujours complet)."""
+        stream_directory = os.path.join(self.directory, stream)
+        os.makedirs(stream_directory, exist_ok=True)
+        
+        path = os.path.join(stream_directory, "chunk_%06d.npy" % index)
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as chunk_file:
+            np.save(chunk_file, chunk)
+        os.replace(temporary, path)
+    
+    def _write_events(self, events):
+        """Ajoute des événements au fichier JSON lines."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, "events.jsonl"), "a", encoding="utf-8") as events_file:
+            for event in events:
+                events_file.write(json.dumps(event, ensure_ascii=False) + "\n")
@@ -0,0 +1,115 @@
+from collections import deque
+import numpy as np
+from config import Config
+from creatures.phenotype import Phenotype
+
+class TraitCovariance:
+    """
+    Covariance des traits de la population vivante, pour repérer les traits
+    qui évoluent ensemble. Les produits croisés sont tenus à jour à chaque
+    naissance et chaque mort (un produit matriciel par lot); corrélations
+    et composantes principales en sont déduites sans parcourir la population.
+    Un instantané par génération est conservé pour les dernières générations.
+    """
+    def __init__(self, max_snapshots=None, components=None):
+        size = len(Phenotype.TRAITS)
+        self.count = 0
+        self.sums = np.zeros(size)
+        self.products = np.zeros((size, size))
+        
+        # Instantanés (génération, corrélations, variances et axes principaux), mémoire bornée
+        self.components = components or Config.COVARIANCE_COMPONENTS
+        self.snapshots = deque(maxlen=max_snapshots or Config.COVARIANCE_HISTORY)
+    
+    def reset(self, genes):
+        """Recalcule les produits croisés à partir de la population complète."""
+        self.count = len(genes)
+        self.sums = genes.sum(axis=0)
+        self.products = genes.T @ genes
+    
+    def add(self, genes):
+        """Prend en compte des naissances."""
+        if len(genes):
+            self.count += len(genes)
+            self.sums += genes.sum(axis=0)
+            self.products += genes.T @ genes
+    
+    def remove(self, genes):
+        """Prend en compte des morts."""
+        if len(genes):
+            self.count -= len(genes)
+            self.sums -= genes.sum(axis=0)
+            self.products -= genes.T @ genes
+    
+    def covariance(self):
+        """Matrice de covariance des traits (ordre de Phenotype.TRAITS)."""
+        if self.count == 0:
+            return np.zeros_like(self.products)
+        
+        means = self.sums / self.count
+        return self.products / self.count - np.outer(means, means)
+    
+    def correlation(self, generation=None):
+        """
+        Matrice de corrélation des traits (génération courante par défaut);
+        un trait sans variance n'est corrélé à aucun autre.
+        """
+        if generation is not None:
+            return self.snapshot(generation)["correlation"]
+        
+        covariance = self.covariance()
+        stds = np.sqrt(np.maximum(np.diag(covariance), 0))
+        varying = stds > 1e-9
+        
+        correlation = np.zeros_like(covariance)
+        scale = np.outer(stds[varying], stds[varying])
+        correlation[np.ix_(varying, varying)] = np.clip(covariance[np.ix_(varying, varying)] / scale, -1, 1)
+        return correlation
+    
+    def principal_components(self, count=None):
+        """
+        Composantes principales de la matrice de corrélation (traits à des
+        échelles différentes): parts de variance expliquée et axes, du plus
+        au moins important. Retourne (parts, axes) avec un axe par ligne.
+        """
+        count = count or self.components
+        eigenvalues, eigenvectors = np.linalg.eigh(self.correlation())
+        order = np.argsort(eigenvalues)[::-1][:count]
+        
+        eigenvalues = np.maximum(eigenvalues, 0)
+        ratios = eigenvalues[order] / max(eigenvalues.sum(), 1e-9)
+        return ratios, eigenvectors[:, order].T
+    
+    def store(self, generation):
+        """Conserve les corrélations et les composantes principales d'une génération."""
+        ratios, axes = self.principal_components()
+        snapshot = {
+            "generation": generation,
+            "correlation": self.correlation(),
+            "explained_variance": ratios,
+            "components": axes
+        }
+        
+        if self.snapshots and self.snapshots[-1]["generation"] == generation:
+            self.snapshots[-1] = snapshot
+        else:
+            self.snapshots.append(snapshot)
+    
+    def snapshot(self, generation):
+        """Instantané conservé d'une génération."""
+        for snapshot in self.snapshots:
+            if snapshot["generation"] == generation:
+                return snapshot
+        raise KeyError(generation)
+    
+    def strongest_pairs(self, count=5, generation=None):
+        """Paires de traits les plus corrélées: liste de (trait, trait, corrélation)."""
+        correlation = self.correlation(generation)
+        first, second = np.triu_indices(len(correlation), k=1)
+        values = correlation[first, second]
+        order = np.argsort(-np.abs(values))[:count]
+        
+        return [
+            (Phenotype.TRAITS[first[i]], Phenotype.TRAITS[second[i]], float(values[i]))
+            for i in order
+        ]
@@ -0,0 +1,128 @@
+from collections import deque
+import numpy as np
+from config import Config
+from creatures.phenotype import Phenotype
+
+class TraitHistograms:
+    """
+    Histogrammes à classes fixes de chaque trait de la population vivante.
+    Les effectifs sont mis à jour à chaque naissance et chaque mort; écart-type,
+    percentiles et indice de diversité en sont déduits en temps constant,
+    quelle que soit la taille de la population. Un instantané compact est
+    conservé par génération pour les dernières générations.
+    """
+    def __init__(self, bins=None, max_snapshots=None):
+        self.bins = bins or Config.HISTOGRAM_BINS
+        
+        # Bornes de chaque trait (couleurs sur 0-255, booléens sur 0-1, autres sur 0-100)
+        self.lows = np.zeros(len(Phenotype.TRAITS))
+        self.highs = np.array([
+            255.0 if trait in Phenotype.COLOR_TRAITS else 1.0 if trait in Phenotype.BOOLEAN_TRAITS else 100.0
+            for trait in Phenotype.TRAITS
+        ])
+        self.widths = (self.highs - self.lows) / self.bins
+        self.centers = self.lows[:, None] + (np.arange(self.bins)[None, :] + 0.5) * self.widths[:, None]
+        
+        # Effectifs courants (un histogramme par trait)
+        self.counts = np.zeros((len(Phenotype.TRAITS), self.bins), dtype=np.int64)
+        
+        # Instantanés par génération, mémoire bornée (les plus anciens sont oubliés)
+        self.snapshots = {}
+        self.generations = deque()
+        self.max_snapshots = max_snapshots or Config.HISTOGRAM_HISTORY
+    
+    def _bincount(self, genes):
+        """Effectifs par trait et par classe d'un ensemble de vecteurs de traits."""
+        classes = np.floor((genes - self.lows) / self.widths).astype(np.int64)
+        np.clip(classes, 0, self.bins - 1, out=classes)
+        flat = classes + np.arange(len(Phenotype.TRAITS)) * self.bins
+        return np.bincount(flat.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+    
+    def reset(self, genes):
+        """Recalcule les histogrammes à partir de la population complète."""
+        self.counts = self._bincount(genes)
+    
+    def add(self, genes):
+        """Prend en compte des naissances."""
+        if len(genes):
+            self.counts += self._bincount(genes)
+    
+    def remove(self, genes):
+        """Prend en compte des morts."""
+        if len(genes):
+            self.counts -= self._bincount(genes)
+    
+    def store(self, generation):
+        """Conserve les histogrammes courants pour une génération."""
+        if generation not in self.snapshots:
+            self.generations.append(generation)
+            if len(self.generations) > self.max_snapshots:
+                del self.snapshots[self.generations.popleft()]
+        
+        self.snapshots[generation] = self.counts.astype(np.int32)
+    
+    def histogram(self, trait, generation=None):
+        """Effectifs et bornes des classes d'un trait (génération courante par défaut)."""
+        index = Phenotype.INDEX[trait]
+        counts = self.counts
+        if generation is not None:
+            counts = self.snapshots[generation]
+        
+        edges = self.lows[index] + np.arange(self.bins + 1) * self.widths[index]
+        return counts[index], edges
+    
+    def means(self, counts=None):
+        """Moyenne de chaque trait (centres des classes)."""
+        counts = self.counts if counts is None else counts
+        return (counts * self.centers).sum(axis=1) / np.maximum(counts.sum(axis=1), 1)
+    
+    def stds(self, counts=None):
+        """Écart-type de chaque trait (centres des classes)."""
+        counts = self.counts if counts is None else counts
+        totals = np.maximum(counts.sum(axis=1), 1)
+        means = (counts * self.centers).sum(axis=1) / totals
+        variances = (counts * (self.centers - means[:, None]) ** 2).sum(axis=1) / totals
+        return np.sqrt(variances)
+    
+    def percentiles(self, q, counts=None):
+        """
+        Percentile q (0-100) de chaque trait, par interpolation linéaire dans
+        la classe qui le contient.
+        """
+        counts = self.counts if counts is None else counts
+        cumulative = np.cumsum(counts, axis=1)
+        totals = cumulative[:, -1]
+        target = totals * q / 100
+        
+        # Classe contenant le percentile et part de la classe à parcourir
+        classes = np.minimum((cumulative < target[:, None]).sum(axis=1), self.bins - 1)
+        rows = np.arange(len(counts))
+        before = np.where(classes > 0, cumulative[rows, np.maximum(classes - 1, 0)], 0)
+        inside = counts[rows, classes]
+        fraction = np.where(inside > 0, (target - before) / np.maximum(inside, 1), 0)
+        
+        return self.lows + (classes + np.clip(fraction, 0, 1)) * self.widths
+    
+    def diversity(self, counts=None):
+        """
+        Indice de diversité (0-1): proportion équilibrée pour les booléens,
+        écart-type normalisé pour les traits numériques, couleurs ignorées.
+        """
+        counts = self.counts if counts is None else counts
+        scores = []
+        stds = self.stds(counts)
+        
+        for trait, index in Phenotype.INDEX.items():
+            if trait in Phenotype.COLOR_TRAITS:
+                continue
+            
+            if trait in Phenotype.BOOLEAN_TRAITS:
+                # Diversité maximale quand la proportion est proche de 0.5
+                true_ratio = counts[index, -1] / max(counts[index].sum(), 1)
+                scores.append(1 - abs(0.5 - true_ratio) * 2)
+            else:
+                # Écart-type maximal pour une distribution uniforme [0, 100]
+                max_possible_std = 100 / np.sqrt(12)
+                scores.append(min(1.0, stds[index] / max_possible_std))
+        
+        return float(np.mean(scores))
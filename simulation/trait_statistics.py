@@ -0,0 +1,130 @@
+import numpy as np
+from creatures.phenotype import Phenotype
+
+class TraitStatistics:
+    """
+    Moments des traits de la population vivante: effectif, sommes, sommes
+    des carrés, minimum et maximum de chaque trait (ordre de Phenotype.TRAITS).
+    Tenus à jour à chaque naissance et à chaque mort. Le nombre de créatures
+    qui atteignent chaque extrême est suivi: un extrême n'est recalculé que
+    lorsque la dernière créature qui l'atteignait disparaît. Les extrêmes des
+    traits booléens se déduisent des effectifs.
+    """
+    # Colonnes des traits booléens (extrêmes déduits des sommes)
+    BOOLEAN_COLUMNS = np.array([Phenotype.INDEX[trait] for trait in Phenotype.BOOLEAN_TRAITS])
+    
+    def __init__(self):
+        size = len(Phenotype.TRAITS)
+        self.count = 0
+        self.sums = np.zeros(size)
+        self.sums_sq = np.zeros(size)
+        self.mins = np.full(size, np.inf)
+        self.maxs = np.full(size, -np.inf)
+        
+        # Nombre de créatures vivantes qui atteignent le minimum et le maximum de chaque trait
+        self.min_holders = np.zeros(size, dtype=np.int64)
+        self.max_holders = np.zeros(size, dtype=np.int64)
+        
+        # Traits dont le minimum ou le maximum est à recalculer
+        self.stale = np.zeros(size, dtype=bool)
+    
+    @staticmethod
+    def genes_of(creatures):
+        """Matrice des vecteurs de traits (une ligne par créature)."""
+        return np.array([c.genome.phenotype.genes for c in creatures]).reshape(len(creatures), len(Phenotype.TRAITS))
+    
+    def reset(self, genes):
+        """Recalcule tous les moments à partir de la population complète."""
+        self.count = len(genes)
+        self.sums = genes.sum(axis=0)
+        self.sums_sq = (genes ** 2).sum(axis=0)
+        self.mins = np.full(genes.shape[1], np.inf)
+        self.maxs = np.full(genes.shape[1], -np.inf)
+        self.min_holders[:] = 0
+        self.max_holders[:] = 0
+        self.stale[:] = False
+        self._merge_extremes(genes)
+    
+    def add(self, genes):
+        """Prend en compte des naissances."""
+        if len(genes) == 0:
+            return
+        
+        self.count += len(genes)
+        self.sums += genes.sum(axis=0)
+        self.sums_sq += (genes ** 2).sum(axis=0)
+        self._merge_extremes(genes)
+    
+    def remove(self, genes):
+        """Prend en compte des morts."""
+        if len(genes) == 0:
+            return
+        
+        self.count -= len(genes)
+        self.sums -= genes.sum(axis=0)
+        self.sums_sq -= (genes ** 2).sum(axis=0)
+        
+        # Seule la disparition de la dernière créature qui atteignait un extrême le rend périmé
+        self.min_holders -= (genes == self.mins).sum(axis=0)
+        self.max_holders -= (genes == self.maxs).sum(axis=0)
+        self.stale |= (self.min_holders <= 0) | (self.max_holders <= 0)
+    
+    def means(self):
+        """Moyenne de chaque trait."""
+        return self.sums / max(self.count, 1)
+    
+    def variances(self):
+        """Variance de chaque trait."""
+        means = self.means()
+        return np.maximum(self.sums_sq / max(self.count, 1) - means ** 2, 0)
+    
+    def extremes(self, population):
+        """
+        Minimum et maximum de chaque trait. Les traits booléens sont déduits
+        des sommes; les autres traits périmés sont recalculés sur la matrice
+        des traits du registre (colonnes concernées seulement).
+        """
+        booleans = TraitStatistics.BOOLEAN_COLUMNS
+        if self.count:
+            ones = np.round(self.sums[booleans]).astype(np.int64)
+            self.mins[booleans] = np.where(ones < self.count, 0.0, 1.0)
+            self.maxs[booleans] = np.where(ones > 0, 1.0, 0.0)
+            self.min_holders[booleans] = np.where(ones < self.count, self.count - ones, ones)
+            self.max_holders[booleans] = np.where(ones > 0, ones, self.count - ones)
+            self.stale[booleans] = False
+        
+        if self.stale.any():
+            columns = np.flatnonzero(self.stale)
+            genes = population.registry.gene_matrix()[:, columns]
+            if len(genes):
+                self.mins[columns] = genes.min(axis=0)
+                self.maxs[columns] = genes.max(axis=0)
+                self.min_holders[columns] = (genes == self.mins[columns]).sum(axis=0)
+                self.max_holders[columns] = (genes == self.maxs[columns]).sum(axis=0)
+            else:
+                self.mins[columns] = np.inf
+                self.maxs[columns] = -np.inf
+                self.min_holders[columns] = 0
+                self.max_holders[columns] = 0
+            self.stale[:] = False
+        
+        return self.mins, self.maxs
+    
+    def _merge_extremes(self, genes):
+        """Intègre les extrêmes d'un lot de créatures et le nombre de créatures qui les atteignent."""
+        if len(genes) == 0:
+            return
+        
+        block_mins = genes.min(axis=0)
+        block_maxs = genes.max(axis=0)
+        min_hits = (genes == block_mins).sum(axis=0)
+        max_hits = (genes == block_maxs).sum(axis=0)
+        
+        self.min_holders = np.where(
+            block_mins < self.mins, min_hits, self.min_holders + np.where(block_mins == self.mins, min_hits, 0)
+        )
+        self.max_holders = np.where(
+            block_maxs > self.maxs, max_hits, self.max_holders + np.where(block_maxs == self.maxs, max_hits, 0)
+        )
+        np.minimum(self.mins, block_mins, out=self.mins)
+        np.maximum(self.maxs, block_maxs, out=self.maxs)
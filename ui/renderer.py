@@ -29,6 +29,11 @@ class Renderer:
         # Statistiques à afficher
         self.show_stats = True
         self.show_grid_lines = False
+        
+        # Lignes du résumé des statistiques déjà rendues, et version des statistiques correspondante
+        self.summary_version = None
+        self.summary_text = None
+        self.summary_lines = []
     
     def render_grid(self):
         """Dessine la grille du monde."""
@@ -161,18 +166,9 @@ class Renderer:
         self.screen.blit(env_title, (Config.SCREEN_WIDTH - Config.UI_PANEL_WIDTH + 10, y_pos))
         y_pos += 25
         
-        # Température et humidité moyennes
-        avg_temp = 0
-        avg_humidity = 0
-        
-        for x in range(self.grid.width):
-            for y in range(self.grid.height):
-                cell = self.grid.get_cell(x, y)
-                avg_temp += cell.temperature
-                avg_humidity += cell.humidity
-        
-        avg_temp /= (self.grid.width * self.grid.height)
-        avg_humidity /= (self.grid.width * self.grid.height)
+        # Température et humidité moyennes (totaux tenus à jour par la grille)
+        avg_temp = self.grid.aggregates.mean("temperature")
+        avg_humidity = self.grid.aggregates.mean("humidity")
         
         temp_text = self.font.render(f"Température: {avg_temp:.1f}°C", True, self.text_color)
         humid_text = self.font.render(f"Humidité: {avg_humidity:.1f}%", True, self.text_color)
@@ -188,17 +184,26 @@ class Renderer:
             self.screen.blit(stats_title, (Config.SCREEN_WIDTH - Config.UI_PANEL_WIDTH + 10, y_pos))
             y_pos += 25
             
-            # Récupérer les statistiques de la population
-            stats_summary = self.population.get_statistics()
+            # Nouvelles statistiques: récupérer le résumé et ne rendre à nouveau les lignes que si le texte a changé
+            version = self.population.statistics.version
+            if version != self.summary_version:
+                self.summary_version = version
+                stats_summary = self.population.get_statistics()
+                
+                if stats_summary != self.summary_text:
+                    self.summary_text = stats_summary
+                    
+                    # Découper le texte en lignes
+                    self.summary_lines = [
+                        self.font.render(line, True, self.text_color)
+                        for line in stats_summary.split('\n')
+                        if line.strip()  # Ignorer les lignes vides
+                    ]
             
             # Afficher le résumé des statistiques
-            # Découper le texte en lignes
-            stats_lines = stats_summary.split('\n')
-            for line in stats_lines:
-                if line.strip():  # Ignorer les lignes vides
-                    stat_text = self.font.render(line, True, self.text_color)
-                    self.screen.blit(stat_text, (Config.SCREEN_WIDTH - Config.UI_PANEL_WIDTH + 10, y_pos))
-                    y_pos += 20
+            for stat_text in self.summary_lines:
+                self.screen.blit(stat_text, (Config.SCREEN_WIDTH - Config.UI_PANEL_WIDTH + 10, y_pos))
+                y_pos += 20
             
             y_pos += 10
         
@@ -1,31 +1,94 @@
+from config import Config
+
 class Cell:
     """
     Représente une cellule individuelle dans la grille du monde.
     Contient des informations sur le terrain, les conditions environnementales
     et les ressources disponibles.
+    Les champs numériques (terrain, température, humidité, nourriture, eau)
+    sont stockés dans les tableaux de la grille; la cellule en est une vue.
+    Chaque modification tient à jour les totaux de la grille (GridAggregates).
     """
-    def __init__(self, x, y):
+    # Codes numériques des types de terrain (ordre de Config.ENVIRONMENTS)
+    TERRAIN_TYPES = list(Config.ENVIRONMENTS.keys())
+    TERRAIN_CODES = {terrain: code for code, terrain in enumerate(TERRAIN_TYPES)}
+    
+    def __init__(self, grid, x, y):
+        # Grille propriétaire des tableaux de champs
+        self.grid = grid
+        
         # Position dans la grille
         self.x = x
         self.y = y
         
-        # Type de terrain et propriétés visuelles
-        self.terrain_type = "forest"  # Par défaut
-        self.color = (34, 139, 34)    # Vert forêt par défaut
+        # Propriétés visuelles
+        self.color = Config.ENVIRONMENTS[self.terrain_type]
         
-        # Conditions environnementales
-        self.temperature = 20   # En degrés Celsius
-        self.humidity = 50      # Pourcentage
-        self.elevation = 0      # En mètres
-        
-        # Ressources disponibles
-        self.food = 0           # Quantité de nourriture
-        self.water = 0          # Quantité d'eau
+        # Élévation en mètres
+        self.elevation = 0
         
         # État spécial (pour les catastrophes naturelles, etc.)
         self.special_state = None  # None, "burning", "flooded", etc.
         self.state_duration = 0    # Durée restante de l'état spécial
     
+    @property
+    def terrain_code(self):
+        """Code numérique du type de terrain."""
+        return self.grid.terrain[self.x, self.y]
+    
+    @property
+    def terrain_type(self):
+        """Type de terrain (water, desert, forest, mountain)."""
+        return Cell.TERRAIN_TYPES[self.grid.terrain[self.x, self.y]]
+    
+    @terrain_type.setter
+    def terrain_type(self, terrain_type):
+        code = Cell.TERRAIN_CODES[terrain_type]
+        self.grid.aggregates.change_terrain(self.grid.terrain[self.x, self.y], code)
+        self.grid.terrain[self.x, self.y] = code
+    
+    @property
+    def temperature(self):
+        """Température en degrés Celsius."""
+        return self.grid.temperature[self.x, self.y]
+    
+    @temperature.setter
+    def temperature(self, temperature):
+        self.set_field("temperature", temperature)
+    
+    @property
+    def humidity(self):
+        """Humidité en pourcentage."""
+        return self.grid.humidity[self.x, self.y]
+    
+    @humidity.setter
+    def humidity(self, humidity):
+        self.set_field("humidity", humidity)
+    
+    @property
+    def food(self):
+        """Quantité de nourriture."""
+        return self.grid.food[self.x, self.y]
+    
+    @food.setter
+    def food(self, food):
+        self.set_field("food", food)
+    
+    @property
+    def water(self):
+        """Quantité d'eau."""
+        return self.grid.water[self.x, self.y]
+    
+    @water.setter
+    def water(self, water):
+        self.set_field("water", water)
+    
+    def set_field(self, field, value):
+        """Modifie un champ numérique de la cellule en ajustant le total de la grille."""
+        values = getattr(self.grid, field)
+        self.grid.aggregates.add(field, value - values[self.x, self.y])
+        values[self.x, self.y] = value
+    
     def get_habitability(self):
         """
         Calcule un score d'habitabilité pour cette cellule.
@@ -333,29 +333,12 @@ class Environment:
         season = self.get_current_season()
         time_of_day = "day" if 0.25 <= self.day_night_cycle < 0.75 else "night"
         
-        # Calculer les conditions moyennes
-        avg_temp = 0
-        avg_humidity = 0
-        cell_count = 0
-        
-        for x in range(self.grid.width):
-            for y in range(self.grid.height):
-                cell = self.grid.get_cell(x, y)
-                if cell:
-                    avg_temp += cell.temperature
-                    avg_humidity += cell.humidity
-                    cell_count += 1
-        
-        avg_temp /= cell_count if cell_count > 0 else 1
-        avg_humidity /= cell_count if cell_count > 0 else 1
-        
-        # Compter les cellules par type de terrain
-        terrain_counts = {terrain: 0 for terrain in Config.ENVIRONMENTS.keys()}
-        for x in range(self.grid.width):
-            for y in range(self.grid.height):
-                cell = self.grid.get_cell(x, y)
-                if cell:
-                    terrain_counts[cell.terrain_type] += 1
+        # Conditions moyennes et cellules par type de terrain (totaux tenus à jour par la grille)
+        aggregates = self.grid.aggregates
+        avg_temp = aggregates.mean("temperature")
+        avg_humidity = aggregates.mean("humidity")
+        cell_count = aggregates.cell_count
+        terrain_counts = aggregates.terrain_distribution()
         
         # Calculer les pourcentages
         terrain_percentages = {
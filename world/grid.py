@@ -1,17 +1,36 @@
 import numpy as np
 from config import Config
 from world.cell import Cell
+from world.grid_aggregates import GridAggregates
 
 class Grid:
     """
     Représente la grille 2D du monde de la simulation.
     Gère l'état environnemental de chaque cellule.
     """
+    # Nourriture apparue par type de terrain (bornes de np.random.randint)
+    FOOD_SPAWN = {
+        "water": (1, 3),
+        "desert": (0, 2),
+        "forest": (2, 5),
+        "mountain": (0, 2)
+    }
+    
     def __init__(self, width, height):
         self.width = width
         self.height = height
         self.cells = np.empty((width, height), dtype=object)
         
+        # Champs des cellules stockés sous forme de tableaux (indexés [x, y])
+        self.terrain = np.full((width, height), Cell.TERRAIN_CODES["forest"], dtype=np.int8)
+        self.temperature = np.full((width, height), 20.0)  # En degrés Celsius
+        self.humidity = np.full((width, height), 50.0)     # Pourcentage
+        self.food = np.zeros((width, height))              # Quantité de nourriture
+        self.water = np.zeros((width, height))             # Quantité d'eau
+        
+        # Totaux courants des champs (moyennes et répartition des terrains en temps constant)
+        self.aggregates = GridAggregates(self)
+        
         # Initialisation des cellules
         self.initialize_cells()
         
@@ -22,12 +41,15 @@ class Grid:
         self.global_temperature = 20  # En degrés Celsius
         self.global_humidity = 50     # Pourcentage
         self.day_night_cycle = 0      # 0 = jour complet, 1 = nuit complète
+        
+        # Compteur de frames (dégradation périodique des ressources)
+        self.frame_counter = 0
     
     def initialize_cells(self):
         """Initialise chaque cellule de la grille."""
         for x in range(self.width):
             for y in range(self.height):
-                self.cells[x, y] = Cell(x, y)
+                self.cells[x, y] = Cell(self, x, y)
     
     def generate_world(self):
         """Génère une carte du monde aléatoire mais cohérente."""
@@ -69,6 +91,8 @@ class Grid:
     
     def update(self):
         """Met à jour l'état de la grille à chaque frame."""
+        self.frame_counter += 1
+        
         # Mise à jour des ressources (nourriture, etc.)
         self.update_resources()
         
@@ -83,57 +107,43 @@ class Grid:
     
     def update_resources(self):
         """Met à jour les ressources de chaque cellule."""
-        for x in range(self.width):
-            for y in range(self.height):
-                # Probabilité de génération de nourriture basée sur le type de terrain
-                cell = self.cells[x, y]
-                
-                # Régénération de nourriture basée sur le type de terrain
-                if np.random.random() < Config.FOOD_SPAWN_RATE:
-                    if cell.terrain_type == "water":
-                        cell.food += np.random.randint(1, 3)
-                    elif cell.terrain_type == "desert":
-                        cell.food += np.random.randint(0, 2)
-                    elif cell.terrain_type == "forest":
-                        cell.food += np.random.randint(2, 5)
-                    elif cell.terrain_type == "mountain":
-                        cell.food += np.random.randint(0, 2)
-                
-                # Limiter la quantité maximale de nourriture par cellule
-                cell.food = min(cell.food, 10)
+        # Régénération de nourriture basée sur le type de terrain
+        spawn = np.random.random(self.food.shape) < Config.FOOD_SPAWN_RATE
+        terrain = self.terrain[spawn]
+        low = np.array([Grid.FOOD_SPAWN[t][0] for t in Cell.TERRAIN_TYPES])[terrain]
+        high = np.array([Grid.FOOD_SPAWN[t][1] for t in Cell.TERRAIN_TYPES])[terrain]
+        self.food[spawn] += np.random.randint(low, high)
+        
+        # Limiter la quantité maximale de nourriture par cellule
+        np.minimum(self.food, 10, out=self.food)
+        self.aggregates.refresh("food")
     
     def diffuse_environment(self):
         """Diffuse les conditions environnementales entre cellules voisines."""
         # Pour une version simple, nous allons juste stabiliser légèrement
-        # vers la moyenne des cellules voisines
-        temp_grid = np.zeros((self.width, self.height))
-        humidity_grid = np.zeros((self.width, self.height))
+        # vers la moyenne des cellules voisines (la cellule comprise)
+        diffusion_rate = 0.1  # Taux de diffusion (0-1)
         
-        # Calcul des moyennes
-        for x in range(self.width):
-            for y in range(self.height):
-                neighbors_temp = []
-                neighbors_humidity = []
-                
-                # Vérification des 8 cellules voisines
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        nx, ny = x + dx, y + dy
-                        if 0 <= nx < self.width and 0 <= ny < self.height:
-                            neighbors_temp.append(self.cells[nx, ny].temperature)
-                            neighbors_humidity.append(self.cells[nx, ny].humidity)
-                
-                # Calculer les moyennes
-                temp_grid[x, y] = np.mean(neighbors_temp)
-                humidity_grid[x, y] = np.mean(neighbors_humidity)
+        for field in (self.temperature, self.humidity):
+            neighborhood = self.neighborhood_mean(field)
+            field *= 1 - diffusion_rate
+            field += neighborhood * diffusion_rate
+        self.aggregates.refresh("temperature", "humidity")
+    
+    def neighborhood_mean(self, values):
+        """Moyenne de chaque cellule et de ses 8 voisines (dans les limites de la grille)."""
+        padded = np.pad(values, 1)
+        counts = np.pad(np.ones_like(values), 1)
+        sums = np.zeros_like(values)
+        neighbors = np.zeros_like(values)
         
-        # Application des changements avec lissage
-        diffusion_rate = 0.1  # Taux de diffusion (0-1)
-        for x in range(self.width):
-            for y in range(self.height):
-                cell = self.cells[x, y]
-                cell.temperature = cell.temperature * (1 - diffusion_rate) + temp_grid[x, y] * diffusion_rate
-                cell.humidity = cell.humidity * (1 - diffusion_rate) + humidity_grid[x, y] * diffusion_rate
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                window = (slice(1 + dx, 1 + dx + self.width), slice(1 + dy, 1 + dy + self.height))
+                sums += padded[window]
+                neighbors += counts[window]
+        
+        return sums / neighbors
     
     def update_day_night_cycle(self):
         """Met à jour le cycle jour/nuit."""
@@ -257,11 +267,11 @@ class Grid:
         """Dégrade périodiquement les ressources pour simuler l'épuisement naturel."""
         # Appliquer tous les X frames (par exemple tous les 50 frames)
         if self.frame_counter % 50 == 0:
-            for x in range(self.width):
-                for y in range(self.height):
-                    cell = self.cells[x, y]
-                    # Réduire la nourriture de 5-10%
-                    cell.food *= 0.9 + np.random.random() * 0.05
-                    # Réduire l'eau sauf dans les cellules d'eau
-                    if cell.terrain_type != "water":
-                        cell.water *= 0.9 + np.random.random() * 0.05
\ No newline at end of file
+            # Réduire la nourriture de 5-10%
+            self.food *= 0.9 + np.random.random(self.food.shape) * 0.05
+            
+            # Réduire l'eau sauf dans les cellules d'eau
+            land = self.terrain != Cell.TERRAIN_CODES["water"]
+            self.water[land] *= 0.9 + np.random.random(int(land.sum())) * 0.05
+            
+            self.aggregates.refresh("food", "water")
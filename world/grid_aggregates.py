@@ -0,0 +1,54 @@
+import numpy as np
+from world.cell import Cell
+
+class GridAggregates:
+    """
+    Totaux courants des champs de la grille: sommes de température,
+    d'humidité, de nourriture et d'eau, et nombre de cellules par type de
+    terrain. Recalculés en une réduction par passe vectorisée, ajustés
+    d'un écart lors des modifications ponctuelles d'une cellule; la
+    lecture d'une moyenne ou d'un total est en temps constant.
+    """
+    # Champs numériques suivis (tableaux de la grille du même nom)
+    FIELDS = ("temperature", "humidity", "food", "water")
+    
+    def __init__(self, grid):
+        self.grid = grid
+        self.cell_count = grid.width * grid.height
+        self.totals = {}
+        self.terrain_counts = np.zeros(len(Cell.TERRAIN_TYPES), dtype=np.int64)
+        self.refresh()
+    
+    def refresh(self, *fields):
+        """
+        Recalcule les totaux des champs donnés ("terrain" pour le nombre de
+        cellules par terrain; tous par défaut) à partir des tableaux de la grille.
+        """
+        fields = fields or GridAggregates.FIELDS + ("terrain",)
+        for field in fields:
+            if field != "terrain":
+                self.totals[field] = float(getattr(self.grid, field).sum())
+        
+        if "terrain" in fields:
+            self.terrain_counts = np.bincount(self.grid.terrain.ravel(), minlength=len(Cell.TERRAIN_TYPES))
+    
+    def add(self, field, delta):
+        """Ajoute un écart au total d'un champ (modification ponctuelle)."""
+        self.totals[field] += float(delta)
+    
+    def change_terrain(self, old_code, new_code):
+        """Prend en compte le changement de terrain d'une cellule."""
+        self.terrain_counts[old_code] -= 1
+        self.terrain_counts[new_code] += 1
+    
+    def total(self, field):
+        """Somme d'un champ sur toute la grille."""
+        return self.totals[field]
+    
+    def mean(self, field):
+        """Moyenne d'un champ sur toute la grille."""
+        return self.totals[field] / self.cell_count
+    
+    def terrain_distribution(self):
+        """Nombre de cellules par type de terrain."""
+        return dict(zip(Cell.TERRAIN_TYPES, self.terrain_counts.tolist()))